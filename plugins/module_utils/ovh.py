@@ -2,6 +2,14 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import fcntl
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
 try:
     import ovh
     from ovh.exceptions import (
@@ -17,6 +25,23 @@ try:
 except ImportError:
     HAS_OVH = False
 
+# Default number of API calls run at the same time by wrap_calls
+DEFAULT_MAX_WORKERS = 10
+
+# Final statuses of the asynchronous tasks of the API (dedicated server, nasha, ip, vrack, domain...)
+TASK_DONE_STATUSES = ["done"]
+TASK_ERROR_STATUSES = ["customerError", "ovhError", "cancelled", "error"]
+# Status given by wait_for_tasks to a task the API does not know (anymore)
+TASK_MISSING_STATUS = "notFound"
+
+# Parts of the description of a dedicated server, and their route under /dedicated/server/{serviceName}
+DEDICATED_SERVER_FACT_PATHS = {
+    "server": "",
+    "hardware": "/specifications/hardware",
+    "network": "/specifications/network",
+    "ip": "/specifications/ip",
+}
+
 
 def ovh_argument_spec():
     return dict(
@@ -27,6 +52,54 @@ def ovh_argument_spec():
     )
 
 
+def ovh_wait_argument_spec(max_retry=240, sleep=10, max_sleep=60):
+    """
+    Options shared by the modules waiting for asynchronous operations.
+    """
+    return dict(
+        max_retry=dict(required=False, default=max_retry),
+        sleep=dict(required=False, default=sleep),
+        max_sleep=dict(required=False, type="float", default=max_sleep),
+        timeout=dict(required=False, type="float", default=None),
+    )
+
+
+def load_json_store(path: str) -> dict:
+    """
+    Load a local JSON store, an empty dict if it does not exist yet or is unreadable.
+    """
+    try:
+        with open(os.path.expanduser(path), "r") as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_json_store(path: str, update) -> dict:
+    """
+    Update a local JSON store under an exclusive lock, as several hosts of a play can write it at the same time.
+    The file is replaced atomically.
+
+    Args:
+        path: path of the store.
+        update: function called with the current content, modifying it in place.
+    """
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        content = load_json_store(path)
+        update(content)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as stream:
+            json.dump(content, stream)
+        os.replace(tmp_path, path)
+    return content
+
+
 class OVHError(Exception):
     pass
 
@@ -35,9 +108,30 @@ class OVHResourceNotFound(Exception):
     pass
 
 
+class RateLimiter:
+    """
+    Spread the calls to at most 'rate' calls per second, shared by all the threads.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / float(rate)
+        self.lock = threading.Lock()
+        self.next_call = time.monotonic()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
 class OVH:
     def __init__(self, module):
         self.module = module
+        # Optional RateLimiter applied to every call
+        self.rate_limiter = None
 
         self._validate()
         self._credentials()
@@ -67,9 +161,10 @@ class OVH:
             cred in self.module.params for cred in self.credentials
         ]
 
-    def wrap_call(self, verb: str, path: str, _need_auth: bool = True, **kwargs):
+    def call(self, verb: str, path: str, _need_auth: bool = True, **kwargs):
         """
-        Wrapper for the call to the api. Set kwargs using methods from the ovh module.
+        Call the api, raising OVHError on failure instead of failing the module.
+        As it never calls fail_json, it can be used from worker threads.
 
         Args:
             verb: http verb to use for the call.
@@ -90,20 +185,641 @@ class OVH:
         if not kwargs:
             kwargs = None
 
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
         try:
             return self.client.call(verb, path, kwargs, _need_auth)
 
         except ResourceNotFoundError:
-            raise OVHResourceNotFound
+            raise OVHResourceNotFound(f"Resource not found ({verb} {self.client._endpoint}{path})")
         except InvalidKey as e:
-            self.module.fail_json(
-                msg=f"Key {self.client._application_key}: {e}"
+            raise OVHError(f"Key {self.client._application_key}: {e}")
+        except (BadParametersError, NotGrantedCall, HTTPError, APIError) as e:
+            raise OVHError(f"Fails calling API ({verb} {self.client._endpoint}{path}): {e}")
+
+    def wrap_call(self, verb: str, path: str, _need_auth: bool = True, **kwargs):
+        """
+        Wrapper for the call to the api. Set kwargs using methods from the ovh module.
+
+        Args:
+            verb: http verb to use for the call.
+            path: API route to call.
+            _need_auth: If True, send authentication headers. This is the default.
+        """
+        try:
+            return self.call(verb, path, _need_auth, **kwargs)
+        except OVHError as e:
+            self.module.fail_json(msg=str(e))
+
+    def wrap_calls(
+        self, calls: list, max_workers: int = DEFAULT_MAX_WORKERS, ignore_missing: bool = False, return_errors: bool = False
+    ) -> list:
+        """
+        Run several calls to the api concurrently.
+        Results are returned in the same order as the calls.
+        The module fails on the first error, including a 404, once the calls not started yet are cancelled.
+
+        Args:
+            calls: list of (verb, path, kwargs) tuples.
+            max_workers: maximum number of calls running at the same time.
+            ignore_missing: if True, a call answered with a 404 returns None instead of raising OVHResourceNotFound.
+            return_errors: if True, the OVHError or OVHResourceNotFound of a failed call is returned in place
+                of its result, so that a batch over many services can report errors per service.
+        """
+        if not calls:
+            return []
+
+        def call(verb, path, kwargs):
+            try:
+                return self.call(verb, path, **kwargs)
+            except OVHResourceNotFound as e:
+                if ignore_missing:
+                    return None
+                if return_errors:
+                    return e
+                raise
+            except OVHError as e:
+                if return_errors:
+                    return e
+                raise
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(call, verb, path, kwargs)
+                for verb, path, kwargs in calls
+            ]
+            wait(futures, return_when=FIRST_EXCEPTION)
+            try:
+                return [future.result() for future in futures]
+            except (OVHError, OVHResourceNotFound) as e:
+                # The queued calls are not run once the module has failed, only the running ones end
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.module.fail_json(msg=str(e))
+
+
+def ovh_cache_argument_spec(validate: bool = True):
+    """
+    Options of the modules reading immutable resources through an ImmutableCache.
+    cache_validate is left out for the resources which do not depend on the generation of a server.
+    """
+    spec = dict(
+        cache_file=dict(required=False, type="str", default=None),
+        cache_flush=dict(required=False, type="bool", default=False),
+    )
+    if validate:
+        spec["cache_validate"] = dict(required=False, type="bool", default=False)
+    return spec
+
+
+def server_generation(client, service_name: str) -> str:
+    """
+    Identifier of the last reinstallation and of the last intervention of a dedicated server.
+    It changes when the hardware of the server may have changed.
+    """
+    return server_generations(client, [service_name])[service_name]
+
+
+def server_generations(client, service_names: list, max_workers: int = DEFAULT_MAX_WORKERS) -> dict:
+    """
+    server_generation of several dedicated servers, read concurrently.
+    """
+    results = iter(client.wrap_calls(
+        [
+            call
+            for service_name in service_names
+            for call in (
+                ("GET", f"/dedicated/server/{service_name}/intervention", {}),
+                ("GET", f"/dedicated/server/{service_name}/task", dict(function="reinstallServer")),
             )
-        except BadParametersError as e:
-            self.module.fail_json(msg=f"Fails calling API ({verb} {self.client._endpoint}{path}): {e}")
-        except NotGrantedCall as e:
-            self.module.fail_json(msg=f"Fails calling API ({verb} {self.client._endpoint}{path}): {e}")
-        except HTTPError as e:
-            self.module.fail_json(msg=f"Fails calling API ({verb} {self.client._endpoint}{path}): {e}")
-        except APIError as e:
-            self.module.fail_json(msg=f"Fails calling API ({verb} {self.client._endpoint}{path}): {e}")
+        ],
+        max_workers=max_workers,
+    ))
+    generations = {}
+    for service_name, interventions, reinstalls in zip(service_names, results, results):
+        generations[service_name] = f"{max(interventions, default=0)}-{max(reinstalls, default=0)}"
+    return generations
+
+
+class ImmutableCache:
+    """
+    Permanent cache of API resources which never change for a given service,
+    such as the hardware specifications of a dedicated server, kept in a local JSON store.
+
+    Entries have no TTL. They are only invalidated by flush(), or when they are read
+    with a generation (see server_generation) different from the one they were stored with.
+    """
+
+    def __init__(self, client, path: str = None):
+        self.client = client
+        self.path = path
+        self.content = load_json_store(path) if path else {}
+        self.updates = {}
+        self.flushed = []
+
+    @classmethod
+    def from_params(cls, client, params, prefix=None):
+        """
+        Build the cache from the options of ovh_cache_argument_spec.
+        With cache_flush, the entries under prefix, a string or a tuple of strings, are flushed
+        (all entries without prefix).
+        """
+        cache = cls(client, params.get("cache_file"))
+        if params.get("cache_flush"):
+            cache.flush(prefix)
+        return cache
+
+    def get(self, path: str, generation: str = None):
+        """
+        Read a resource from the cache, or from the api on a miss.
+        """
+        return self.get_many([path], generation)[0]
+
+    def get_many(self, paths: list, generation=None, max_workers: int = DEFAULT_MAX_WORKERS) -> list:
+        """
+        Read resources from the cache, and the missing ones concurrently from the api.
+        Results are returned in the same order as the paths.
+        generation is either shared by all the paths, or a dict of path => generation.
+        """
+        generations = generation if isinstance(generation, dict) else dict.fromkeys(paths, generation)
+        missing = [path for path in dict.fromkeys(paths) if not self.contains(path, generations.get(path))]
+        results = self.client.wrap_calls([("GET", path, {}) for path in missing], max_workers=max_workers)
+        for path, value in zip(missing, results):
+            self.store(path, value, generations.get(path))
+
+        self.save()
+        return [self.value(path) for path in paths]
+
+    def contains(self, path: str, generation: str = None) -> bool:
+        """
+        Whether the resource is cached, with the given generation if any.
+        """
+        return path in self.content and (generation is None or self.content[path].get("generation") == generation)
+
+    def value(self, path: str):
+        return self.content[path]["value"]
+
+    def store(self, path: str, value, generation: str = None):
+        """
+        Cache a resource read by the caller. Call save() to write it to the store.
+        """
+        self.content[path] = self.updates[path] = dict(value=value, generation=generation)
+
+    def flush(self, prefix: str = None):
+        """
+        Remove the entries under prefix, a string or a tuple of strings, all the entries without prefix.
+        """
+        for path in list(self.content):
+            if prefix is None or path.startswith(prefix):
+                del self.content[path]
+                self.updates.pop(path, None)
+                self.flushed.append(path)
+        if prefix is None:
+            self.flushed.append(None)
+        self.save()
+
+    def save(self):
+        """
+        Write the changes to the store. Entries written meanwhile by other hosts are kept.
+        """
+        if not self.path or not (self.updates or self.flushed):
+            return
+
+        def update(content):
+            if None in self.flushed:
+                content.clear()
+            for path in self.flushed:
+                content.pop(path, None)
+            content.update(self.updates)
+
+        update_json_store(self.path, update)
+        self.updates = {}
+        self.flushed = []
+
+
+def netboots(client, cache: ImmutableCache, service_names: list, max_workers: int = DEFAULT_MAX_WORKERS) -> dict:
+    """
+    Available netboots of dedicated servers, as a dict of service name => {kernel: bootId}.
+    Servers of the same range share the same netboots: the netboots are cached by their ids,
+    and their details are only read, concurrently, for the first server having these ids.
+    The kernel "hd" is named "harddisk", which is the bootType of the API.
+    """
+    paths = {service_name: f"/dedicated/server/{service_name}/boot" for service_name in service_names}
+    missing = [path for path in paths.values() if not cache.contains(path)]
+    for path, boot_ids in zip(missing, client.wrap_calls([("GET", path, {}) for path in missing], max_workers=max_workers)):
+        cache.store(path, sorted(boot_ids))
+
+    catalogs = {}
+    for service_name, path in paths.items():
+        catalogs[service_name] = f"netboot/{','.join(str(boot_id) for boot_id in cache.value(path))}"
+
+    lookups = {}
+    for service_name, catalog in catalogs.items():
+        if not cache.contains(catalog):
+            lookups.setdefault(catalog, service_name)
+    calls = [
+        ("GET", f"{paths[service_name]}/{boot_id}", {})
+        for service_name in lookups.values()
+        for boot_id in cache.value(paths[service_name])
+    ]
+    boots_infos = iter(client.wrap_calls(calls, max_workers=max_workers))
+    for catalog, service_name in lookups.items():
+        netboot = {}
+        for _ in cache.value(paths[service_name]):
+            boot_infos = next(boots_infos)
+            kernel = "harddisk" if boot_infos["kernel"] == "hd" else boot_infos["kernel"]
+            netboot[kernel] = boot_infos["bootId"]
+        cache.store(catalog, netboot)
+
+    cache.save()
+    return {service_name: cache.value(catalog) for service_name, catalog in catalogs.items()}
+
+
+class ServicesIndex:
+    """
+    Index of the services of the account for a product route (e.g. /dedicated/server/{serviceName}):
+    resource name => serviceId, kept in a local JSON store.
+
+    A serviceId never changes for a resource, so the index has no TTL. A single missing name is resolved
+    from its serviceInfos. For several missing names, the serviceIds of the route are listed, then either the
+    details of the unknown serviceIds or the serviceInfos of the missing names are read, whichever takes
+    fewer calls, concurrently. Only services() without names reads all the services of the route.
+    """
+
+    def __init__(self, client, route: str, path: str = None, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.client = client
+        self.route = route
+        self.path = path
+        self.max_workers = max_workers
+        self.index = load_json_store(path).get(route, {}) if path else {}
+        # Names looked up during this run which have no service
+        self.absent = set()
+        # Details of the services read during this run, by serviceId
+        self.details = {}
+
+    def service_id(self, name: str) -> int:
+        """
+        serviceId of a resource, None if the account has no such resource.
+        """
+        return self.service_ids([name])[name]
+
+    def service_ids(self, names: list) -> dict:
+        """
+        serviceId of several resources, None for the ones the account does not have.
+        """
+        missing = [name for name in dict.fromkeys(names) if name not in self.index and name not in self.absent]
+        if len(missing) == 1:
+            self.lookup(missing)
+        elif missing:
+            service_ids = self.client.wrap_call("GET", "/services", routes=self.route)
+            known = set(self.index.values())
+            unknown = [service_id for service_id in service_ids if service_id not in known]
+            if len(unknown) <= len(missing):
+                self.refresh(service_ids, unknown)
+            else:
+                self.lookup(missing)
+        self.absent.update(name for name in missing if name not in self.index)
+        return {name: self.index.get(name) for name in names}
+
+    def services(self, names: list = None) -> dict:
+        """
+        Details (/services/{serviceId}) of resources, all the resources of the route by default,
+        read concurrently. Returns a dict of resource name => details, the unknown names are missing.
+        """
+        if names is None:
+            service_ids = self.client.wrap_call("GET", "/services", routes=self.route)
+        else:
+            service_ids = [service_id for service_id in self.service_ids(names).values() if service_id is not None]
+
+        self.read_details([service_id for service_id in service_ids if service_id not in self.details])
+        result = {self.details[service_id]["resource"]["name"]: self.details[service_id] for service_id in service_ids}
+
+        if names is None:
+            self.index = {name: service["serviceId"] for name, service in result.items()}
+            self.save()
+        return result
+
+    def read_details(self, service_ids: list):
+        services = self.client.wrap_calls(
+            [("GET", f"/services/{service_id}", {}) for service_id in service_ids],
+            max_workers=self.max_workers,
+        )
+        for service_id, service in zip(service_ids, services):
+            self.details[service_id] = dict(service, serviceId=service_id)
+
+    def lookup(self, names: list):
+        """
+        Index resources from their serviceInfos, read concurrently. A resource answered with a 404 is left out.
+        """
+        infos = self.client.wrap_calls(
+            [("GET", f"{self.route.format(serviceName=name)}/serviceInfos", {}) for name in names],
+            max_workers=self.max_workers,
+            ignore_missing=True,
+        )
+        for name, info in zip(names, infos):
+            if info is not None:
+                self.index[name] = info["serviceId"]
+        self.save()
+
+    def refresh(self, service_ids: list, unknown: list):
+        """
+        Index the unknown serviceIds of the route from their details, read concurrently.
+        """
+        self.read_details(unknown)
+        # Resources deleted since the last refresh are dropped
+        service_ids = set(service_ids)
+        self.index = {name: service_id for name, service_id in self.index.items() if service_id in service_ids}
+        for service_id in unknown:
+            self.index[self.details[service_id]["resource"]["name"]] = service_id
+        self.save()
+
+    def save(self):
+        if self.path:
+            update_json_store(self.path, lambda content: content.update({self.route: self.index}))
+
+
+class Waiter:
+    """
+    Poll until a condition is met, with an exponential backoff plus jitter between
+    two polls and an overall deadline.
+
+    The interval starts at 'sleep', is multiplied by 'backoff' after each poll without progress,
+    and is capped by 'max_sleep'. A check function reporting progress with progressed()
+    brings it back to 'sleep'. A check function able to predict when the next poll is worth
+    doing gives the interval with hint().
+    """
+
+    def __init__(self, sleep=10, max_sleep=60, timeout=2400, backoff=1.5, jitter=0.1):
+        self.min_interval = float(sleep)
+        self.max_interval = max(float(max_sleep), self.min_interval)
+        self.timeout = float(timeout)
+        self.backoff = backoff
+        self.jitter = jitter
+
+        self.interval = self.min_interval
+        self.start = time.monotonic()
+        self.polls = 0
+        self.slept = 0.0
+        self._progressed = False
+        self._hint = None
+
+    @classmethod
+    def from_params(cls, params, **kwargs):
+        """
+        Build a waiter from the options of ovh_wait_argument_spec.
+        Without timeout, the deadline is max_retry x sleep, the budget of the former fixed interval loops.
+        """
+        timeout = params.get("timeout")
+        if timeout is None:
+            timeout = float(params["max_retry"]) * float(params["sleep"])
+        return cls(sleep=params["sleep"], max_sleep=params.get("max_sleep") or 60, timeout=timeout, **kwargs)
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def remaining(self):
+        return self.timeout - self.elapsed()
+
+    def progressed(self):
+        """
+        To be called by the check function when something moved forward.
+        """
+        self._progressed = True
+
+    def hint(self, interval):
+        """
+        To be called by the check function to set the next interval, within the min and max interval.
+        """
+        self._hint = float(interval)
+
+    def next_interval(self):
+        if self._hint is not None:
+            self.interval = min(max(self._hint, self.min_interval), self.max_interval)
+        elif self._progressed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        self._progressed = False
+        self._hint = None
+        interval = self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(0.0, min(interval, self.remaining()))
+
+    def poll(self, check):
+        """
+        Call check until it returns True or the deadline is reached.
+        Returns True if the check succeeded, False on timeout.
+        """
+        while True:
+            self.polls += 1
+            if check():
+                return True
+            if self.remaining() <= 0:
+                return False
+            interval = self.next_interval()
+            time.sleep(interval)
+            self.slept += interval
+
+    def stats(self):
+        return dict(
+            polls=self.polls,
+            elapsed=round(self.elapsed(), 1),
+            slept=round(self.slept, 1),
+            last_interval=round(self.interval, 1),
+        )
+
+
+def wait_for_tasks(client, waiter, tasks, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Poll tasks concurrently until each one of them is done or in an error status,
+    or until the waiter deadline is reached.
+
+    Args:
+        client: OVH client.
+        waiter: Waiter driving the polling.
+        tasks: list of dict with at least 'path', the API route of the task.
+            An optional 'submitted' timestamp is used as the start of the task duration.
+            An optional 'missing_status' is the status given to the task when the API answers with a 404,
+            as some products (vrack) delete their tasks once done. It defaults to TASK_MISSING_STATUS.
+            Other keys are kept in the result to identify the task.
+        max_workers: maximum number of tasks polled at the same time.
+
+    Returns the tasks completed with their last 'status', 'operation' and 'duration' in seconds.
+    Tasks whose status is neither in TASK_DONE_STATUSES, TASK_ERROR_STATUSES nor TASK_MISSING_STATUS timed out.
+    """
+    now = time.time()
+    reports = [dict(task, status=None, duration=None) for task in tasks]
+    for report in reports:
+        report.setdefault("submitted", now)
+    pending = list(reports)
+
+    def check():
+        tasks_info = client.wrap_calls(
+            [("GET", report["path"], {}) for report in pending],
+            max_workers=max_workers,
+            ignore_missing=True,
+        )
+        now = time.time()
+        for report, task_info in zip(list(pending), tasks_info):
+            if task_info is None:
+                task_info = dict(status=report.get("missing_status", TASK_MISSING_STATUS))
+            report["status"] = task_info["status"]
+            report["operation"] = task_info.get("operation") or task_info.get("function") or report.get("operation")
+            report["duration"] = round(now - report["submitted"], 1)
+            if task_info["status"] in TASK_DONE_STATUSES + TASK_ERROR_STATUSES + [TASK_MISSING_STATUS]:
+                pending.remove(report)
+                waiter.progressed()
+        return not pending
+
+    if pending:
+        waiter.poll(check)
+
+    for report in reports:
+        del report["path"]
+        del report["submitted"]
+        report.pop("missing_status", None)
+    return reports
+
+
+def count_statuses(items: list) -> dict:
+    """
+    Number of items (servers, services...) by 'status'.
+    """
+    summary = {}
+    for item in items:
+        summary[item["status"]] = summary.get(item["status"], 0) + 1
+    return summary
+
+
+def submit_and_wait_tasks(
+    client, waiter, servers, build_call, build_task_path, wait=True, task_id_key="taskId", missing_status=None,
+    max_workers=DEFAULT_MAX_WORKERS,
+):
+    """
+    Submit a call returning a task for each server concurrently, then wait for all the tasks at once.
+    The servers are dicts updated in place: a server whose call failed gets the "failed" status and the error,
+    a submitted one the 'task_id' and the status of its task, then its last status and 'duration' with wait.
+
+    Args:
+        build_call: server => (verb, path, kwargs) of the call returning the task.
+        build_task_path: server => API route of its task, once 'task_id' is set.
+        task_id_key: key of the task id in the result of the call.
+        missing_status: status of a task answered with a 404, see wait_for_tasks.
+
+    Returns the submitted servers.
+    """
+    results = client.wrap_calls([build_call(server) for server in servers], max_workers=max_workers, return_errors=True)
+    submitted = []
+    for server, task in zip(servers, results):
+        if isinstance(task, Exception):
+            server.update(status="failed", error=str(task))
+        else:
+            server.update(task_id=task[task_id_key], status=task["status"])
+            submitted.append(server)
+
+    if wait:
+        tasks = [dict(path=build_task_path(server), server=server) for server in submitted]
+        if missing_status:
+            for task in tasks:
+                task["missing_status"] = missing_status
+        for report in wait_for_tasks(client, waiter, tasks, max_workers=max_workers):
+            report["server"].update(status=report["status"], duration=report["duration"])
+    return submitted
+
+
+def exit_with_servers(module, servers, message, changed, wait, fail_on_error, polling):
+    """
+    Exit a module acting on many servers, failing with fail_on_error if some of them are not done.
+    Without wait, the tasks are only submitted and keep their status, so only the failed servers are not done.
+    """
+    summary = count_statuses(servers)
+    not_done = [
+        server for server in servers
+        if server["status"] not in ("done", "unchanged") and (wait or server["status"] == "failed")
+    ]
+    if not_done and fail_on_error:
+        module.fail_json(
+            msg=f"{message}, not done: {[(s['service_name'], s['status'], s['error']) for s in not_done]}",
+            changed=changed,
+            servers=servers,
+            summary=summary,
+            polling=polling,
+        )
+    module.exit_json(msg=message, changed=changed, servers=servers, summary=summary, polling=polling)
+
+
+def hardware_model(hardware: dict) -> str:
+    """
+    Hardware model of a server, from its /specifications/hardware.
+    """
+    return hardware.get("description") or hardware.get("motherboard")
+
+
+def hardware_specifications(
+    client, cache: ImmutableCache, service_names: list, validate: bool = False, max_workers: int = DEFAULT_MAX_WORKERS
+) -> dict:
+    """
+    /specifications/hardware of dedicated servers through an ImmutableCache, the missing ones read concurrently.
+    With validate, the entries cached before the last reinstallation or intervention of a server are read again.
+    Returns a dict of service name => hardware.
+    """
+    paths = {service_name: f"/dedicated/server/{service_name}/specifications/hardware" for service_name in service_names}
+    generations = None
+    if validate:
+        generations = {
+            paths[service_name]: generation
+            for service_name, generation in server_generations(client, service_names, max_workers).items()
+        }
+    return dict(zip(paths, cache.get_many(list(paths.values()), generations, max_workers=max_workers)))
+
+
+def compatible_templates(
+    client, service_names, cache_file=None, cache_ttl=86400, max_workers=DEFAULT_MAX_WORKERS, hardware_cache=None, validate=False
+):
+    """
+    Compatible OS templates of servers, looked up once for each hardware model.
+    The hardware of the servers missing from hardware_cache is read concurrently, then the compatible
+    templates of a single server of each model not found in the cache. With both caches warm, no call is made.
+
+    Args:
+        client: OVH client.
+        service_names: list of servers.
+        cache_file: optional JSON store keeping the templates of each model between runs.
+        cache_ttl: maximum age in seconds of a model in the cache.
+        max_workers: maximum number of calls running at the same time.
+        hardware_cache: optional ImmutableCache keeping the hardware of the servers, see hardware_specifications.
+        validate: validate the cached hardware against the generation of the servers.
+
+    Returns a dict of service name => (hardware model, list of compatible templates).
+    """
+    hardwares = hardware_specifications(client, hardware_cache or ImmutableCache(client), service_names, validate, max_workers)
+    models = {service_name: hardware_model(hardware) for service_name, hardware in hardwares.items()}
+
+    now = time.time()
+    cache = load_json_store(cache_file) if cache_file else {}
+    templates = {
+        model: entry["templates"]
+        for model, entry in cache.items()
+        if now - entry.get("updated", 0) < cache_ttl
+    }
+
+    lookups = {}
+    for service_name, model in models.items():
+        if model not in templates:
+            lookups.setdefault(model, service_name)
+    results = client.wrap_calls(
+        [("GET", f"/dedicated/server/{service_name}/install/compatibleTemplates", {}) for service_name in lookups.values()],
+        max_workers=max_workers,
+    )
+    fetched = {}
+    for model, result in zip(lookups, results):
+        # Templates are grouped by owner (ovh, personal)
+        fetched[model] = sorted({template for owner in result.values() for template in owner})
+    templates.update(fetched)
+
+    if cache_file and fetched:
+        update_json_store(
+            cache_file,
+            lambda content: content.update({model: dict(templates=value, updated=now) for model, value in fetched.items()}),
+        )
+
+    return {service_name: (model, templates[model]) for service_name, model in models.items()}
@@ -0,0 +1,132 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = """
+---
+module: dedicated_nasha_info
+short_description: Retrieve capacity and usage of a nasha and its partitions
+description:
+    - Retrieve the properties and the usage (size, used, used by snapshots) of a NAS-HA and of its partitions.
+    - The details of all partitions are fetched concurrently.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    nas_service_name:
+        required: true
+        description:
+            - The name of the NAS
+    partitions:
+        required: false
+        type: list
+        description:
+            - Names of the partitions to retrieve. All the partitions of the NAS by default
+"""
+
+EXAMPLES = """
+- name: Retrieve usage of a nasha
+  synthesio.ovh.dedicated_nasha_info:
+    nas_service_name: "{{ nas_service_name }}"
+  delegate_to: localhost
+  register: nasha_info
+
+- name: Print partitions used at more than 80%
+  debug:
+    msg: "{{ item.name }} is used at {{ item.used_percent }}%"
+  loop: "{{ nasha_info.partitions }}"
+  when: item.used_percent > 80
+"""
+
+RETURN = """
+nasha:
+    description: Properties of the NAS, as returned by /dedicated/nasha/{serviceName}.
+    returned: always
+    type: dict
+use:
+    description: Usage of the NAS, for each usage type.
+    returned: always
+    type: dict
+    sample: {"size": {"unit": "GB", "value": 1200}, "used": {"unit": "GB", "value": 340}, "usedbysnapshots": {"unit": "GB", "value": 12}}
+partitions:
+    description: Properties and usage of each partition.
+    returned: always
+    type: list
+    sample: [{"name": "backup", "protocol": "NFS", "size": 100, "partitionDescription": "",
+              "use": {"size": {"unit": "GB", "value": 100}, "used": {"unit": "GB", "value": 42}, "usedbysnapshots": {"unit": "GB", "value": 1}},
+              "used_percent": 42.0}]
+"""
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, ovh_argument_spec
+
+USE_TYPES = ["size", "used", "usedbysnapshots"]
+
+
+def used_percent(use):
+    """
+    Percentage of the size used, including snapshots, when both are known.
+    """
+    size = (use.get("size") or {}).get("value")
+    used = (use.get("used") or {}).get("value")
+    if not size or used is None:
+        return None
+    return round(100.0 * used / size, 1)
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(
+        dict(
+            nas_service_name=dict(required=True),
+            partitions=dict(required=False, type="list", default=None),
+        )
+    )
+
+    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+    client = OVH(module)
+
+    nas_service_name = module.params["nas_service_name"]
+    partitions = module.params["partitions"]
+
+    nasha = client.wrap_call("GET", f"/dedicated/nasha/{nas_service_name}")
+    if partitions is None:
+        partitions = client.wrap_call("GET", f"/dedicated/nasha/{nas_service_name}/partition")
+
+    # Every call is independent: the NAS usage, and for each partition its properties and usage.
+    # They are all fetched in a single concurrent batch.
+    calls = [
+        ("GET", f"/dedicated/nasha/{nas_service_name}/use", dict(type=use_type))
+        for use_type in USE_TYPES
+    ]
+    for partition in partitions:
+        calls.append(("GET", f"/dedicated/nasha/{nas_service_name}/partition/{partition}", {}))
+        calls.extend(
+            ("GET", f"/dedicated/nasha/{nas_service_name}/partition/{partition}/use", dict(type=use_type))
+            for use_type in USE_TYPES
+        )
+    results = iter(client.wrap_calls(calls))
+
+    use = {use_type: next(results) for use_type in USE_TYPES}
+
+    partitions_info = []
+    for partition in partitions:
+        info = dict(name=partition)
+        info.update(next(results))
+        info["use"] = {use_type: next(results) for use_type in USE_TYPES}
+        info["used_percent"] = used_percent(info["use"])
+        partitions_info.append(info)
+
+    module.exit_json(changed=False, nasha=nasha, use=use, partitions=partitions_info)
+
+
+def main():
+    run_module()
+
+
+if __name__ == "__main__":
+    main()
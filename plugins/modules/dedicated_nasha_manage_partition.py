@@ -13,7 +13,9 @@ DOCUMENTATION = """
 module: dedicated_nasha_manage_partition
 short_description: Create a nasha partition.
 description:
-    - Create a nasha partition with specified ACL and manage snapshots.
+    - Create a nasha partition with specified ACL and manage snapshots and ZFS options.
+    - Several partitions of the same NAS can be managed at once with the C(partitions) option.
+    - The size, description and protocol of an existing partition are updated when they differ.
 author: Digimind SRE Team
 requirements:
     - ovh >= 0.5.0
@@ -23,22 +25,27 @@ options:
         description:
             - The name of the NAS
     nas_partition_name:
-        required: true
+        required: false
         description:
             - The name of the partition you want to create
+            - Required if C(partitions) is not set
     nas_partition_size:
-        required: true
+        required: false
         description:
             - The size of the partition you want to create in Gb. Must be >= 10 Gb
+            - An existing partition is resized online when its size differs
+            - Required if C(partitions) is not set and state is present
     nas_partition_description:
         required: false
         description:
             - The description of the partition
+            - When not set, the description of an existing partition is left untouched
     nas_protocol:
-        required: true
+        required: false
         choices: ['NFS', 'CIFS', 'NFS_CIFS']
         description:
             - The protocol of the partition
+            - Required if C(partitions) is not set and state is present
     nas_partition_acl:
         required: false
         type: list
@@ -53,14 +60,51 @@ options:
         default: []
         description:
             - List of snapshot types
+    nas_partition_options:
+        required: false
+        type: dict
+        default: {}
+        description:
+            - ZFS options of the partition. Only the given options are managed
+            - C(atime) is C(on) or C(off)
+            - C(recordsize) is the record size in bytes, as a string (e.g. "131072")
+            - C(sync) is C(always), C(standard) or C(disabled)
+    partitions:
+        required: false
+        type: list
+        description:
+            - List of partitions to manage in a single run, instead of C(nas_partition_name)
+            - Each item is a dictionary with the keys C(name), C(size), C(description), C(protocol), C(acl), C(snapshot_type), C(options) and C(state)
+            - C(acl), C(snapshot_type) and C(options) take the same format as C(nas_partition_acl), C(nas_partition_snapshot_type)
+              and C(nas_partition_options)
+            - C(state) defaults to the C(state) of the module
+    state:
+        required: false
+        default: present
+        choices: ['present', 'absent']
+        description:
+            - Indicate the desired state of the partition(s)
     max_retry:
         required: false
-        description: Number of retry
+        description:
+            - Number of retry
+            - Without C(timeout), the maximum wait time of each phase is C(max_retry) x C(sleep)
         default: 120
     sleep:
         required: false
-        description: Time to sleep between retries
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff while no task completes
         default: 5
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description:
+            - Maximum time in seconds to wait for the tasks of each phase
+            - The creation of the partitions, then their snapshots, options and ACLs, are two phases
 """
 
 EXAMPLES = """
@@ -84,45 +128,289 @@ EXAMPLES = """
         state: absent
       - type: day-1
         state: present
+    nas_partition_options:
+      atime: "off"
+      recordsize: "131072"
+      sync: "disabled"
     state: "{{ state }}"
     sleep: 5
     max_retry: 120
+
+- name: Manage several partitions of a nasha at once
+  synthesio.ovh.dedicated_nasha_manage_partition:
+    nas_service_name: "{{ nas_service_name }}"
+    partitions:
+      - name: backup
+        size: 100
+        protocol: NFS
+        acl:
+          - ip: XX.XX.XX.XX/32
+        snapshot_type:
+          - type: day-1
+      - name: scratch
+        size: 50
+        protocol: NFS
+      - name: old
+        state: absent
 """
 
 RETURN = """
 changed:
     description: Indicates whether the module made any changes.
     type: bool
+partitions:
+    description: Per partition result.
+    returned: always
+    type: list
+    sample: [{"name": "backup", "changed": true, "snapshots": [["day-1", "create"]], "acls": [["XX.XX.XX.XX/32", "create"]],
+              "options": {"sync": ["standard", "disabled"]}, "updates": {"size": [100, 200]}, "size": {"before": 100, "after": 200}}]
+tasks:
+    description: NASHA tasks submitted by the module, with their last status and duration in seconds.
+    returned: always
+    type: list
+    sample: [{"task_id": 123456, "operation": "clusterZfsSnapshotCreate", "status": "done", "duration": 12.3}]
+polling:
+    description: Polling statistics of the wait for the tasks, by phase (creation, configuration).
+    returned: always
+    type: dict
+    sample: {"creation": {"polls": 4, "elapsed": 42.1, "slept": 40.3, "last_interval": 16.9},
+             "configuration": {"polls": 2, "elapsed": 12.5, "slept": 11.8, "last_interval": 7.5}}
 """
 
 # TODO:
 # 1. Manage properties of NASHA : dedicated/nasha/{servicename} , monitored=True
-# 1. Manage option of partition : dedicated/nasha/{servicename}/partition/{partitionname}/options
-#    {atime: "off", recordsize: "131072", sync: "disabled"} // {atime: "on", recordsize: "131072", sync: "always"}
-# 1. manage changes in size, description or protocol
 
-from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, ovh_argument_spec
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    OVH,
+    Waiter,
+    ovh_argument_spec,
+    ovh_wait_argument_spec,
+    wait_for_tasks,
+)
 import time
 
+SNAPSHOT_TYPES = ["day-1", "day-2", "day-3", "day-7", "hour-1", "hour-6"]
+
+# Allowed values of the ZFS options of a partition
+OPTIONS_CHOICES = dict(
+    atime=["on", "off"],
+    recordsize=["4096", "8192", "16384", "32768", "65536", "131072", "262144", "524288", "1048576"],
+    sync=["always", "standard", "disabled"],
+)
+
+
+def wait_for_tasks_to_complete(client, waiter, service, tasks):
+    """
+    Wait for several NASHA tasks at once.
+
+    Args:
+        tasks: dict of task id => timestamp of the submission of the task
+
+    Returns a tuple (report, pending): report is the list of the polled tasks with their
+    last status and duration, pending the list of the task ids not done.
+    """
+    report = wait_for_tasks(client, waiter, [
+        dict(task_id=task_id, path=f"/dedicated/nasha/{service}/task/{task_id}", submitted=submitted)
+        for task_id, submitted in tasks.items()
+    ])
+    return report, [task["task_id"] for task in report if task["status"] != "done"]
+
+
+def submit_tasks(client, calls, tasks):
+    """
+    Run the calls concurrently and register the returned tasks with their submission time.
+    """
+    for res in client.wrap_calls(calls):
+        if res and res.get("taskId"):
+            tasks[res["taskId"]] = time.time()
+
+
+def build_partition_plan(existing, wanted):
+    """
+    Compare the properties of an existing partition with the wanted ones.
+    Returns a dict of API property => (current value, wanted value) for the properties to change.
+    The description is only compared when it is given.
+    """
+    plan = {}
+    if int(existing["size"]) != int(wanted["size"]):
+        plan["size"] = (existing["size"], int(wanted["size"]))
+    if existing["protocol"] != wanted["protocol"]:
+        plan["protocol"] = (existing["protocol"], wanted["protocol"])
+    if wanted["description"] is not None and existing.get("partitionDescription") != wanted["description"]:
+        plan["partitionDescription"] = (existing.get("partitionDescription"), wanted["description"])
+    return plan
+
+
+def build_snapshot_plan(existing, wanted):
+    """
+    Compare the existing snapshot types of a partition with the wanted ones.
+    Returns the list of (type, action) for every snapshot type, action being one of
+    unchanged, create or delete.
+    """
+    wanted_states = {w["type"]: w.get("state", "present") for w in wanted}
+    plan = []
+    for snapshot_type in SNAPSHOT_TYPES:
+        current_state = "present" if snapshot_type in existing else "absent"
+        wanted_state = wanted_states.get(snapshot_type, "unknown")
+
+        if current_state == wanted_state or wanted_state == "unknown":
+            action = "unchanged"
+        elif current_state == "present" and wanted_state == "absent":
+            action = "delete"
+        else:
+            action = "create"
+        plan.append((snapshot_type, action))
+    return plan
+
+
+def build_acl_plan(existing, wanted):
+    """
+    Compare the existing ACLs of a partition, indexed by IP, with the wanted ones.
+    Returns the wanted ACLs completed with their state, type and action, action being one of
+    unchanged, create, update or delete.
+    """
+    plan = []
+    for acl in wanted:
+        acl_wanted = dict(acl)
+        acl_wanted.setdefault("state", "present")
+        if acl_wanted["state"] == "present":
+            acl_wanted.setdefault("type", "readwrite")
+        else:
+            acl_wanted.pop("type", None)
+
+        matching_acl = existing.get(acl_wanted["ip"])
+        if matching_acl:
+            if acl_wanted["state"] == "absent":
+                acl_wanted["action"] = "delete"
+            elif matching_acl["type"] == acl_wanted["type"]:
+                acl_wanted["action"] = "unchanged"
+            else:
+                acl_wanted["action"] = "update"
+        else:
+            if acl_wanted["state"] == "absent":
+                acl_wanted["action"] = "unchanged"
+            else:
+                acl_wanted["action"] = "create"
+        plan.append(acl_wanted)
+    return plan
+
+
+def build_options_plan(existing, wanted):
+    """
+    Compare the existing ZFS options of a partition with the wanted ones.
+    Returns a dict of option => (current value, wanted value) for the options to change.
+    """
+    return {
+        option: (existing.get(option), str(value))
+        for option, value in wanted.items()
+        if str(existing.get(option)) != str(value)
+    }
+
+
+def options_calls(service, partition, existing, plan):
+    if not plan:
+        return []
+    # The options are set together, keep the current value of the options not managed
+    options = {option: existing[option] for option in OPTIONS_CHOICES if existing.get(option) is not None}
+    options.update({option: values[1] for option, values in plan.items()})
+    return [(
+        "POST",
+        "/dedicated/nasha/{0}/partition/{1}/options".format(service, partition),
+        options,
+    )]
+
+
+def snapshot_calls(service, partition, plan):
+    calls = []
+    for snapshot_type, action in plan:
+        if action == "delete":
+            calls.append((
+                "DELETE",
+                "/dedicated/nasha/{0}/partition/{1}/snapshot/{2}".format(
+                    service, partition, snapshot_type
+                ),
+                {},
+            ))
+        elif action == "create":
+            calls.append((
+                "POST",
+                "/dedicated/nasha/{0}/partition/{1}/snapshot".format(service, partition),
+                dict(snapshotType=snapshot_type),
+            ))
+    return calls
 
-def wait_for_tasks_to_complete(client, storage, service, task_id, sleep, max_retry):
-    i = 0
-    waitForCompletion = True
-    while waitForCompletion and i < float(max_retry):
-        waitForCompletion = False
-        task_info = client.wrap_call(
-            "GET",
-            f"/dedicated/{storage}/{service}/task/{task_id}"
-        )
-        if task_info["status"] != "done":
-            waitForCompletion = True
-            print(
-                f"Task {task_id} is in {task_info['status']} status, waiting for its completion...[i:{i}]"
-            )
 
-        if waitForCompletion:
-            time.sleep(float(sleep))
-        i += 1
+def acl_calls(service, partition, plan):
+    calls = []
+    for acl_wanted in plan:
+        if acl_wanted["action"] == "delete":
+            calls.append((
+                "DELETE",
+                "/dedicated/nasha/{0}/partition/{1}/access/{2}".format(
+                    service, partition, quote(acl_wanted["ip"], safe='')
+                ),
+                {},
+            ))
+        elif acl_wanted["action"] in ("create", "update"):
+            # Create or Update ACL
+            calls.append((
+                "POST",
+                "/dedicated/nasha/{0}/partition/{1}/access".format(service, partition),
+                dict(ip=acl_wanted["ip"], type=acl_wanted["type"]),
+            ))
+    return calls
+
+
+def wanted_partitions(module):
+    """
+    Build the list of partitions to manage, from the 'partitions' option
+    or from the single partition options.
+    """
+    state = module.params["state"]
+    if module.params["partitions"]:
+        partitions = [
+            dict(
+                name=partition.get("name"),
+                size=partition.get("size"),
+                description=partition.get("description"),
+                protocol=partition.get("protocol"),
+                acl=partition.get("acl") or [],
+                snapshot_type=partition.get("snapshot_type") or [],
+                options=partition.get("options") or {},
+                state=partition.get("state", state),
+            )
+            for partition in module.params["partitions"]
+        ]
+    else:
+        partitions = [dict(
+            name=module.params["nas_partition_name"],
+            size=module.params["nas_partition_size"],
+            description=module.params["nas_partition_description"],
+            protocol=module.params["nas_protocol"],
+            acl=module.params["nas_partition_acl"] or [],
+            snapshot_type=module.params["nas_partition_snapshot_type"] or [],
+            options=module.params["nas_partition_options"] or {},
+            state=state,
+        )]
+
+    for partition in partitions:
+        if not partition["name"]:
+            module.fail_json(msg="Every partition must have a name.")
+        if partition["state"] not in ("present", "absent"):
+            module.fail_json(msg="Partition {0}: state must be present or absent.".format(partition["name"]))
+        if partition["state"] == "present":
+            if partition["size"] is None or int(partition["size"]) < 10:
+                module.fail_json(msg="Partition size must be greater than or equal to 10 Gb.")
+            if partition["protocol"] not in ("NFS", "CIFS", "NFS_CIFS"):
+                module.fail_json(msg="Partition {0}: protocol must be one of NFS, CIFS, NFS_CIFS.".format(partition["name"]))
+        for option, value in partition["options"].items():
+            if option not in OPTIONS_CHOICES:
+                module.fail_json(msg="Partition {0}: unknown option {1}, must be one of {2}.".format(
+                    partition["name"], option, list(OPTIONS_CHOICES)))
+            if str(value) not in OPTIONS_CHOICES[option]:
+                module.fail_json(msg="Partition {0}: option {1} must be one of {2}.".format(
+                    partition["name"], option, OPTIONS_CHOICES[option]))
+    return partitions
 
 
 def run_module():
@@ -130,44 +418,50 @@ def run_module():
     module_args.update(
         dict(
             nas_service_name=dict(required=True),
-            nas_partition_name=dict(required=True),
+            nas_partition_name=dict(required=False),
             nas_partition_description=dict(required=False),
-            nas_partition_size=dict(required=True),
-            nas_protocol=dict(required=True, choices=["NFS", "CIFS", "NFS_CIFS"]),
+            nas_partition_size=dict(required=False),
+            nas_protocol=dict(required=False, choices=["NFS", "CIFS", "NFS_CIFS"]),
             nas_partition_acl=dict(required=False, type="list", default=[]),
-            nas_partition_snapshot_type=dict(required=False, type="list", defaults=[]),
-            state=dict(required=False, default="present"),
-            max_retry=dict(required=False, default=120),
-            sleep=dict(required=False, default=5),
+            nas_partition_snapshot_type=dict(required=False, type="list", default=[]),
+            nas_partition_options=dict(required=False, type="dict", default={}),
+            partitions=dict(required=False, type="list", elements="dict"),
+            state=dict(required=False, default="present", choices=["present", "absent"]),
         )
     )
+    module_args.update(ovh_wait_argument_spec(max_retry=120, sleep=5))
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        required_one_of=[["nas_partition_name", "partitions"]],
+        mutually_exclusive=[["nas_partition_name", "partitions"]],
+    )
     client = OVH(module)
 
     nas_service_name = module.params["nas_service_name"]
-    nas_partition_name = module.params["nas_partition_name"]
-    nas_partition_description = module.params["nas_partition_description"]
-    nas_partition_size = module.params["nas_partition_size"]
-    if int(nas_partition_size) < 10:
-        module.fail_json(msg="Partition size must be greater than or equal to 10 Gb.")
-    nas_protocol = module.params["nas_protocol"]
-    nas_partition_acl = module.params["nas_partition_acl"]
-    nas_partition_snapshot_type = module.params["nas_partition_snapshot_type"]
-    state = module.params["state"]
-    max_retry = module.params["max_retry"]
-    sleep = module.params["sleep"]
+    # Each wait phase has its own deadline, the creation of the partitions does not use up the others
+    polling = {}
+    partitions_wanted = wanted_partitions(module)
 
-    # Message that will be sent at the end of execution
-    final_message = ""
     DRY_RUN_MSG = ""
 
     if module.check_mode:
         DRY_RUN_MSG = " - (dry run mode)"
 
+    # Result of each partition: message that will be sent at the end of execution and changes
+    results = {
+        partition["name"]: dict(name=partition["name"], msg="", changed=False)
+        for partition in partitions_wanted
+    }
+    # Tasks submitted by independent operations, awaited together at the end
+    tasks = {}
+    tasks_report = []
+
     # ***************** PARTITION MANAGEMENT *****************
 
     # Check if zpool exist !
+    # The NAS and its partitions are fetched once for all the partitions to manage
 
     client.wrap_call(
         "GET",
@@ -181,301 +475,280 @@ def run_module():
         "/dedicated/nasha/{0}/partition".format(nas_service_name)
     )
 
-    # If partition state is absent, we delete it and exit module execution
-    if state == "absent" and nas_partition_name in partitions:
-        if not module.check_mode:
-            # Delete the partition
-            client.wrap_call(
-                "DELETE",
-                "/dedicated/nasha/{0}/partition/{1}".format(
-                    nas_service_name, nas_partition_name
-                )
+    # Properties of the partitions to keep, to detect size, description or protocol drift
+    kept = [
+        partition for partition in partitions_wanted
+        if partition["state"] == "present" and partition["name"] in partitions
+    ]
+    partitions_existing = dict(zip(
+        [partition["name"] for partition in kept],
+        client.wrap_calls([
+            (
+                "GET",
+                "/dedicated/nasha/{0}/partition/{1}".format(nas_service_name, partition["name"]),
+                {},
             )
-
-        module.exit_json(
-            msg="Partition {0} has been deleted.{1}\n".format(
-                nas_partition_name, DRY_RUN_MSG
-            ),
-            changed=True,
-        )
-
-    # If partition state is present, and does not exists, we create it
-    elif state == "present" and nas_partition_name not in partitions:
-        if not module.check_mode:
-            # Create partition
-            res = client.wrap_call(
+            for partition in kept
+        ])
+    ))
+
+    deletion_calls = []
+    creation_calls = []
+    update_calls = []
+    for partition in partitions_wanted:
+        name = partition["name"]
+        result = results[name]
+
+        # If partition state is absent, we delete it
+        if partition["state"] == "absent" and name in partitions:
+            deletion_calls.append((
+                "DELETE",
+                "/dedicated/nasha/{0}/partition/{1}".format(nas_service_name, name),
+                {},
+            ))
+            result["msg"] = "Partition {0} has been deleted.\n".format(name)
+            result["changed"] = True
+
+        # If partition state is absent, and does not exists
+        elif partition["state"] == "absent":
+            result["msg"] = "Partition {0} is already deleted.\n".format(name)
+
+        # If partition state is present, and does not exists, we create it
+        elif name not in partitions:
+            creation_calls.append((
                 "POST",
                 "/dedicated/nasha/{0}/partition".format(nas_service_name),
-                partitionDescription=nas_partition_description,
-                partitionName=nas_partition_name,
-                protocol=nas_protocol,
-                size=nas_partition_size
+                dict(
+                    partitionDescription=partition["description"],
+                    partitionName=name,
+                    protocol=partition["protocol"],
+                    size=partition["size"],
+                ),
+            ))
+            result["msg"] = "Partition {0} has been created.\n".format(name)
+            result["changed"] = True
+
+        # If partition state is present, and partition exist, update its properties if needed
+        else:
+            current = partitions_existing[name]
+            plan = build_partition_plan(current, partition)
+            result["updates"] = plan
+            if not plan:
+                result["msg"] = "Partition {0} is already created.\n".format(name)
+                continue
+
+            properties = dict(
+                partitionDescription=current.get("partitionDescription"),
+                protocol=current["protocol"],
+                size=current["size"],
             )
-            wait_for_tasks_to_complete(
-                client, "nasha", nas_service_name, res["taskId"], sleep, max_retry
+            properties.update({prop: values[1] for prop, values in plan.items()})
+            update_calls.append((
+                "PUT",
+                "/dedicated/nasha/{0}/partition/{1}".format(nas_service_name, name),
+                properties,
+            ))
+            result["msg"] = "Partition {0} has been updated with {1}.\n".format(
+                name, {prop: values[1] for prop, values in plan.items()}
             )
-
-        final_message = "Partition {0} has been created.\n".format(
-            nas_partition_name,
+            result["changed"] = True
+            if "size" in plan:
+                result["size"] = dict(before=plan["size"][0], after=plan["size"][1])
+
+    if not module.check_mode:
+        submit_tasks(client, deletion_calls + update_calls, tasks)
+
+        # Snapshots and ACLs need the partitions, so their creation is awaited first
+        creation_tasks = {}
+        submit_tasks(client, creation_calls, creation_tasks)
+        waiter = Waiter.from_params(module.params)
+        report, pending = wait_for_tasks_to_complete(
+            client, waiter, nas_service_name, creation_tasks
         )
-        partition_changed = True
-
-    # If partition state is present, and partition exist
-    # TODO: manage changes in size, description or protocol
-    elif state == "present" and nas_partition_name in partitions:
-        final_message = "Partition {0} is already created.\n".format(
-            nas_partition_name
-        )
-        partition_changed = False
+        polling["creation"] = waiter.stats()
+        tasks_report.extend(report)
+        if pending:
+            module.fail_json(
+                msg="Creation of partitions failed or max wait time reached, tasks {0} are not done.".format(pending),
+                tasks=tasks_report,
+                polling=polling,
+            )
 
-    # If partition state is absent, and does not exists
-    elif state == "absent" and nas_partition_name not in partitions:
-        module.exit_json(
-            msg="Partition {0} is already deleted.{1}".format(
-                nas_partition_name, DRY_RUN_MSG
-            ),
-            changed=False,
-        )
+    # Partitions left to configure. In dry run mode, the partitions to create do not exist yet,
+    # so they are considered without snapshot nor ACL
+    configured = [partition for partition in partitions_wanted if partition["state"] == "present"]
+    existing = [
+        partition for partition in configured
+        if partition["name"] in partitions or not module.check_mode
+    ]
+    write_calls = []
 
     # ***************** SNAPSHOT MANAGEMENT *****************
 
-    # If nas_partition_snapshot_type exists and not empty
-    if nas_partition_snapshot_type:
-        # Snapshot that already exists for partition
-        nas_partition_snapshot_existing = []
-        # Wanted snapshots
-        nas_partition_snapshot_wanted = nas_partition_snapshot_type
+    # Get all snapshots of the partitions which specify snapshot types
+    with_snapshot = [partition for partition in existing if partition["snapshot_type"]]
+    snapshots_existing = dict(zip(
+        [partition["name"] for partition in with_snapshot],
+        client.wrap_calls([
+            (
+                "GET",
+                "/dedicated/nasha/{0}/partition/{1}/snapshot".format(nas_service_name, partition["name"]),
+                {},
+            )
+            for partition in with_snapshot
+        ])
+    ))
+
+    for partition in configured:
+        name = partition["name"]
+        result = results[name]
+        result["snapshots"] = []
+
+        # If snapshot_type exists and not empty
+        if not partition["snapshot_type"]:
+            result["msg"] += " No snapshot specified.\n"
+            continue
+
+        plan = build_snapshot_plan(snapshots_existing.get(name, []), partition["snapshot_type"])
+        write_calls.extend(snapshot_calls(nas_service_name, name, plan))
+
+        result["snapshots"] = [item for item in plan if item[1] != "unchanged"]
+        if len(result["snapshots"]) == 0:
+            result["msg"] += " No changes in snapshot configuration.\n"
+        else:
+            result["msg"] += " And setup snapshot like this {0}\n".format(result["snapshots"])
+            result["changed"] = True
+
+    # ***************** OPTIONS MANAGEMENT *****************
 
-        # Get all snapshots of partition
-        nas_partition_snapshot_existing = client.wrap_call(
-            "GET",
-            "/dedicated/nasha/{0}/partition/{1}/snapshot".format(
-                nas_service_name, nas_partition_name
+    # Get the ZFS options of the partitions which specify options
+    with_options = [partition for partition in existing if partition["options"]]
+    options_existing = dict(zip(
+        [partition["name"] for partition in with_options],
+        client.wrap_calls([
+            (
+                "GET",
+                "/dedicated/nasha/{0}/partition/{1}/options".format(nas_service_name, partition["name"]),
+                {},
             )
-        )
+            for partition in with_options
+        ])
+    ))
 
-        # Init nas_partition_snapshot matrix
-        nas_partition_snapshot = [
-            {'type': 'day-1', 'current_state': 'unknown', 'wanted_state': 'unknown', 'action': ''},
-            {'type': 'day-2', 'current_state': 'unknown', 'wanted_state': 'unknown', 'action': ''},
-            {'type': 'day-3', 'current_state': 'unknown', 'wanted_state': 'unknown', 'action': ''},
-            {'type': 'day-7', 'current_state': 'unknown', 'wanted_state': 'unknown', 'action': ''},
-            {'type': 'hour-1', 'current_state': 'unknown', 'wanted_state': 'unknown', 'action': ''},
-            {'type': 'hour-6', 'current_state': 'unknown', 'wanted_state': 'unknown', 'action': ''}
-        ]
+    for partition in configured:
+        name = partition["name"]
+        result = results[name]
+        result["options"] = {}
 
-        res = []
+        if not partition["options"]:
+            continue
 
-        # Update wanted_state in nas_partition_snapshot
-        for wanted in nas_partition_snapshot_wanted:
-            for snapshot in nas_partition_snapshot:
-                if snapshot["type"] == wanted["type"]:
-                    snapshot["wanted_state"] = wanted.get("state", "present")
+        current = options_existing.get(name, {})
+        plan = build_options_plan(current, partition["options"])
+        write_calls.extend(options_calls(nas_service_name, name, current, plan))
 
-        # Update current_state in nas_partition_snapshot
-        for snapshot in nas_partition_snapshot:
-            if snapshot["type"] in nas_partition_snapshot_existing:
-                snapshot["current_state"] = "present"
-            else:
-                snapshot["current_state"] = "absent"
-
-            # Update actions
-            current_state = snapshot["current_state"]
-            wanted_state = snapshot["wanted_state"]
-
-            if (
-                current_state == wanted_state
-                or wanted_state == "unknown"
-            ):
-                snapshot["action"] = "unchanged"
-            elif current_state == "present" and wanted_state == "absent":
-                snapshot["action"] = "delete"
-            elif current_state == "absent" and wanted_state == "present":
-                snapshot["action"] = "create"
-
-            # Modify snapshots according to snapshot action
-            if not module.check_mode:
-                # Delete snapshots
-                if snapshot["action"] == "delete":
-                    res = client.wrap_call(
-                        "DELETE",
-                        "/dedicated/nasha/{0}/partition/{1}/snapshot/{2}".format(
-                            nas_service_name,
-                            nas_partition_name,
-                            snapshot.get("type"),
-                        )
-                    )
-
-                    # Wait for tasks to complete
-                    wait_for_tasks_to_complete(
-                        client, "nasha", nas_service_name, res["taskId"], sleep, max_retry
-                    )
-
-                # Add snapshots
-                elif snapshot["action"] == "create":
-                    res = client.wrap_call(
-                        "POST",
-                        "/dedicated/nasha/{0}/partition/{1}/snapshot".format(
-                            nas_service_name, nas_partition_name
-                        ),
-                        snapshotType=snapshot.get("type"),
-                    )
-
-                    # Wait for tasks to complete
-                    wait_for_tasks_to_complete(
-                        client, "nasha", nas_service_name, res["taskId"], sleep, max_retry
-                    )
-
-        nas_partition_snapshot_changed = [
-            (item.get('type'), item.get('action')) for item in nas_partition_snapshot if item.get('action') != 'unchanged'
-        ]
-        if len(nas_partition_snapshot_changed) == 0:
-            final_message = (final_message
-                             + " No changes in snapshot configuration.\n"
-                             )
+        result["options"] = plan
+        if len(plan) == 0:
+            result["msg"] += " No changes in options.\n"
         else:
-            final_message = (
-                final_message
-                + " And setup snapshot like this {0}\n".format(
-                    nas_partition_snapshot_changed,
-                )
+            result["msg"] += " And setup options like this {0}\n".format(
+                {option: values[1] for option, values in plan.items()}
             )
-            snapshot_changed = True
-    else:
-        final_message = (
-            final_message
-            + " No snapshot specified.\n"
-        )
+            result["changed"] = True
 
     # ***************** ACL MANAGEMENT *****************
-    if nas_partition_acl:
-        nas_partition_acl_existing = []
-        # Get existing IP ACL lists ( just IP )
-        nas_partition_acl_existing_acls = client.wrap_call(
+
+    # Get existing IP ACL lists ( just IP ) of the partitions which specify ACLs
+    with_acl = [partition for partition in existing if partition["acl"]]
+    acl_ips = client.wrap_calls([
+        (
             "GET",
-            "/dedicated/nasha/{0}/partition/{1}/access".format(
-                nas_service_name, nas_partition_name
-            )
+            "/dedicated/nasha/{0}/partition/{1}/access".format(nas_service_name, partition["name"]),
+            {},
+        )
+        for partition in with_acl
+    ])
+
+    # Get existing ACL of each IP of every partition concurrently and index them by IP
+    acl_owners = [
+        partition["name"]
+        for partition, ips in zip(with_acl, acl_ips)
+        for ip in ips
+    ]
+    acl_details = client.wrap_calls([
+        (
+            "GET",
+            "/dedicated/nasha/{0}/partition/{1}/access/{2}".format(
+                nas_service_name, partition["name"], quote(ip, safe='')
+            ),
+            {},
         )
+        for partition, ips in zip(with_acl, acl_ips)
+        for ip in ips
+    ])
+    acls_existing = {}
+    for name, acl in zip(acl_owners, acl_details):
+        acls_existing.setdefault(name, {})[acl["ip"]] = acl
+
+    for partition in configured:
+        name = partition["name"]
+        result = results[name]
+        result["acls"] = []
+
+        if not partition["acl"]:
+            result["msg"] += " No ACL specified.\n"
+            continue
+
+        plan = build_acl_plan(acls_existing.get(name, {}), partition["acl"])
+        write_calls.extend(acl_calls(nas_service_name, name, plan))
+
+        result["acls"] = [(item["ip"], item["action"]) for item in plan if item["action"] != "unchanged"]
+        if len(result["acls"]) == 0:
+            result["msg"] += " No changes in ACL configuration.\n"
+        else:
+            result["msg"] += " And setup ACL like this {0}\n".format(result["acls"])
+            result["changed"] = True
+
+    # Submit every snapshot, option and ACL change of every partition, then wait for their tasks at once
+    if not module.check_mode:
+        submit_tasks(client, write_calls, tasks)
 
-        # Get existing ACL of each IP and populate a list of dict
-        for ip in nas_partition_acl_existing_acls:
-            nas_partition_acl_existing_acl_properties = client.wrap_call(
+    waiter = Waiter.from_params(module.params)
+    report, pending = wait_for_tasks_to_complete(
+        client, waiter, nas_service_name, tasks
+    )
+    polling["configuration"] = waiter.stats()
+    tasks_report.extend(report)
+
+    # Report the capacity of the resized partitions once their resize is done
+    resized = [result for result in results.values() if "size" in result]
+    if resized and not pending and not module.check_mode:
+        for result, partition in zip(resized, client.wrap_calls([
+            (
                 "GET",
-                "/dedicated/nasha/{0}/partition/{1}/access/{2}".format(
-                    nas_service_name, nas_partition_name, quote(ip, safe='')
-                )
-            )
-            nas_partition_acl_existing.append(nas_partition_acl_existing_acl_properties)
-
-        nas_partition_acl_wanted = nas_partition_acl
-        for acl_wanted in nas_partition_acl_wanted:
-            acl_wanted.setdefault("state", "present")
-            acl_wanted.setdefault("action", "unknow")
-            if acl_wanted["state"] == "present":
-                acl_wanted.setdefault("type", "readwrite")
-            elif acl_wanted["state"] == "absent" and 'type' in acl_wanted:
-                del acl_wanted["type"]
-
-        for acl_wanted in nas_partition_acl_wanted:
-            matching_acl = next((acl for acl in nas_partition_acl_existing if acl["ip"] == acl_wanted["ip"]), None)
-            if matching_acl:
-                if "type" in acl_wanted:
-                    if (
-                        matching_acl["type"] == acl_wanted["type"]
-                        and acl_wanted["state"] == "present"
-                    ):
-                        acl_wanted["action"] = "unchanged"
-                    else:
-                        acl_wanted["action"] = "update"
-                else:
-                    acl_wanted["action"] = (
-                        "update" if acl_wanted["state"] != "absent" else "delete"
-                    )
-            else:
-                if acl_wanted in nas_partition_acl_existing:
-                    if acl_wanted["state"] == "absent":
-                        acl_wanted["action"] = "delete"
-                    else:
-                        acl_wanted["action"] = "unchanged"
-                else:
-                    if acl_wanted["state"] == "absent":
-                        acl_wanted["action"] = "unchanged"
-                    else:
-                        acl_wanted["action"] = "create"
-
-        # Executing actions on ACLs
-        for acl_wanted in nas_partition_acl_wanted:
-
-            if acl_wanted["action"] == "delete":
-                # Delete ACL on acl_wanted["ip"]
-                if not module.check_mode:
-                    res = client.wrap_call(
-                        "DELETE",
-                        "/dedicated/nasha/{0}/partition/{1}/access/{2}".format(
-                            nas_service_name,
-                            nas_partition_name,
-                            quote(acl_wanted["ip"], safe=''),
-                        )
-                    )
-
-                    wait_for_tasks_to_complete(
-                        client,
-                        "nasha",
-                        nas_service_name,
-                        res["taskId"],
-                        sleep,
-                        max_retry,
-                    )
-
-            elif acl_wanted["action"] == "update" or acl_wanted["action"] == "create":
-                # Create or Update ACL
-                if not module.check_mode:
-                    res = client.wrap_call(
-                        "POST",
-                        "/dedicated/nasha/{0}/partition/{1}/access".format(
-                            nas_service_name, nas_partition_name
-                        ),
-                        ip=acl_wanted["ip"],
-                        type=acl_wanted["type"],
-                    )
-                    wait_for_tasks_to_complete(
-                        client,
-                        "nasha",
-                        nas_service_name,
-                        res["taskId"],
-                        sleep,
-                        max_retry,
-                    )
-
-        nas_partition_acl_changed = [(item.get('ip'), item.get('action')) for item in nas_partition_acl_wanted if item.get('action') != 'unchanged']
-        if len(nas_partition_acl_changed) == 0:
-            final_message = final_message + " No changes in ACL configuration.\n"
-        else:
-            final_message = final_message + " And setup ACL like this {0}\n".format(
-                nas_partition_acl_changed,
+                "/dedicated/nasha/{0}/partition/{1}".format(nas_service_name, result["name"]),
+                {},
             )
-            acl_changed = True
-    else:
-        final_message = (
-            final_message
-            + " No ACL specified.\n"
+            for result in resized
+        ])):
+            result["size"]["after"] = partition["size"]
+
+    final_message = "".join(result["msg"] for result in results.values())
+    if pending:
+        module.fail_json(
+            msg=final_message + "Tasks failed or max wait time reached, tasks {0} are not done.\n".format(pending),
+            tasks=tasks_report,
+            polling=polling,
         )
 
-    if (
-        ("acl_changed" in locals() and acl_changed)
-        or ("partition_changed" in locals() and partition_changed)
-        or ("snapshot_changed" in locals() and snapshot_changed)
-    ):
-        all_changed = True
-    else:
-        all_changed = False
-
     module.exit_json(
         msg=final_message + "{0}\n".format(
             DRY_RUN_MSG
         ),
-        changed=all_changed,
+        changed=any(result["changed"] for result in results.values()),
+        partitions=list(results.values()),
+        tasks=tasks_report,
+        polling=polling,
     )
 
 
@@ -34,6 +34,19 @@ choices: ['harddisk','rescue-customer','rescue12-customer','ipxe-shell','powerof
         choices: ['true','false']
         description:
             - When you want to force a dedicated server reboot
+    cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the netboots of the servers
+            - The netboots of a server are read once, and shared with the servers having the same netboot ids
+            - A server is read again when the requested boot is not found in its cached netboots
+    cache_flush:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Remove the cached netboots of the server, and the netboot catalogs, before reading them
+            - The other entries of C(cache_file) are kept
 
 """
 
@@ -44,34 +57,31 @@ EXAMPLES = r"""
     boot: "rescue-customer"
     force_reboot: "true"
   delegate_to: localhost
+
+- name: Change the bootid of a fleet, with a cache of the netboots
+  synthesio.ovh.dedicated_server_boot:
+    service_name: "{{ ovhname }}"
+    boot: "harddisk"
+    cache_file: "~/.cache/ovh/immutable.json"
+  delegate_to: localhost
 """
 
 RETURN = """ # """
 
 from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
     OVH,
+    ImmutableCache,
+    netboots,
     ovh_argument_spec,
+    ovh_cache_argument_spec,
 )
 
 
-def build_boot_list(service_name: str, client: OVH) -> dict:
+def build_boot_list(service_name: str, client: OVH, cache: ImmutableCache) -> dict:
     """Build a list of available boot option.
-    Get available netboots, for each one fetch its ID.
+    Get available netboots, then fetch their IDs (see netboots).
     """
-    netboot = dict()
-    boot_ids = client.wrap_call("GET", f"/dedicated/server/{service_name}/boot")
-    for boot_id in boot_ids:
-        boot_infos = client.wrap_call(
-            "GET", f"/dedicated/server/{service_name}/boot/{boot_id}"
-        )
-        if boot_infos["kernel"] == "hd":
-            # The kernel parameter is "hd" in the API
-            # but we use "harddisk", which is the bootType parameter
-            netboot.update({"harddisk": boot_infos["bootId"]})
-        else:
-            netboot.update({boot_infos["kernel"]: boot_infos["bootId"]})
-
-    return netboot
+    return netboots(client, cache, [service_name])[service_name]
 
 
 def run_module():
@@ -86,6 +96,7 @@ def run_module():
             force_reboot=dict(required=False, default=False, type="bool"),
         )
     )
+    module_args.update(ovh_cache_argument_spec(validate=False))
 
     module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
     client = OVH(module)
@@ -95,7 +106,15 @@ def run_module():
     force_reboot = module.params["force_reboot"]
     changed = False
 
-    bootid = build_boot_list(service_name, client)
+    # Only the netboot entries are flushed, the cache file may be shared with other resources
+    cache = ImmutableCache.from_params(
+        client, module.params, prefix=(f"/dedicated/server/{service_name}/boot", "netboot/")
+    )
+    bootid = build_boot_list(service_name, client, cache)
+    if boot not in bootid and module.params["cache_file"]:
+        # The cached netboots may be outdated
+        cache.flush(f"/dedicated/server/{service_name}/boot")
+        bootid = build_boot_list(service_name, client, cache)
 
     if boot not in list(bootid.keys()):
         module.fail_json(
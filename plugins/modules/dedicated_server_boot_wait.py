@@ -22,12 +22,23 @@ options:
         description: Ovh name of the server
     max_retry:
         required: false
-        description: Number of retry
+        description:
+            - Number of retry
+            - Without C(timeout), the maximum wait time is C(max_retry) x C(sleep)
         default: 240
     sleep:
         required: false
-        description: Time to sleep between retries
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff while nothing progresses
         default: 10
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description: Maximum time in seconds to wait
 
 '''
 
@@ -40,19 +51,31 @@ EXAMPLES = r'''
   delegate_to: localhost
 '''
 
-RETURN = ''' # '''
+RETURN = '''
+polling:
+    description: Polling statistics of the wait.
+    returned: always
+    type: dict
+    sample: {"polls": 12, "elapsed": 423.5, "slept": 418.2, "last_interval": 60.0}
+'''
 
-from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, ovh_argument_spec
-import time
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    OVH,
+    TASK_ERROR_STATUSES,
+    TASK_MISSING_STATUS,
+    Waiter,
+    ovh_argument_spec,
+    ovh_wait_argument_spec,
+    wait_for_tasks,
+)
 
 
 def run_module():
     module_args = ovh_argument_spec()
     module_args.update(dict(
         service_name=dict(required=True),
-        max_retry=dict(required=False, default=240),
-        sleep=dict(required=False, default=10)
     ))
+    module_args.update(ovh_wait_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
@@ -61,30 +84,29 @@ def run_module():
     client = OVH(module)
 
     service_name = module.params['service_name']
-    max_retry = module.params['max_retry']
-    sleep = module.params['sleep']
+    waiter = Waiter.from_params(module.params)
 
     if module.check_mode:
         module.exit_json(msg="done - (dry run mode)", changed=False)
 
-    for i in range(1, int(max_retry)):
-        tasklist = client.wrap_call(
-            "GET",
-            f"/dedicated/server/{service_name}/task",
-            function='hardReboot')
-        result = client.wrap_call(
-            "GET",
-            f"/dedicated/server/{service_name}/task/{max(tasklist)}")
-
-        message = ""
-        # Get details in reboot progression
-        if "done" in result['status']:
-            module.exit_json(msg="{}: {}".format(result['status'], message), changed=False)
-        else:
-            message = result['status']
-
-        time.sleep(float(sleep))
-    module.fail_json(msg="Max wait time reached, about %i x %i seconds" % (i, int(sleep)))
+    # The last hardReboot task is the one to wait for, it is resolved once
+    tasklist = client.wrap_call(
+        "GET",
+        f"/dedicated/server/{service_name}/task",
+        function='hardReboot')
+    if not tasklist:
+        module.fail_json(msg=f"No hardReboot task found on {service_name}")
+    task = max(tasklist)
+
+    result = wait_for_tasks(client, waiter, [dict(path=f"/dedicated/server/{service_name}/task/{task}")])[0]
+
+    if result['status'] == "done":
+        module.exit_json(msg="{}: ".format(result['status']), changed=False, polling=waiter.stats())
+    if result['status'] in TASK_ERROR_STATUSES:
+        module.fail_json(msg=f"Task {task} ended in {result['status']} status", polling=waiter.stats())
+    if result['status'] == TASK_MISSING_STATUS:
+        module.fail_json(msg=f"Task {task} not found on {service_name}", polling=waiter.stats())
+    module.fail_json(msg=f"Max wait time reached, about {waiter.stats()['elapsed']} seconds", polling=waiter.stats())
 
 
 def main():
@@ -27,6 +27,11 @@ options:
         required: true
         description:
             - The service name
+    services_cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the serviceId of the servers
+            - With it, the serviceId is not read from the serviceInfos of each server
 '''
 
 EXAMPLES = r'''
@@ -39,14 +44,15 @@ EXAMPLES = r'''
 
 RETURN = ''' # '''
 
-from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, ovh_argument_spec
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, ServicesIndex, ovh_argument_spec
 
 
 def run_module():
     module_args = ovh_argument_spec()
     module_args.update(dict(
         engagement_strategy=dict(required=True),
-        service_name=dict(required=True)
+        service_name=dict(required=True),
+        services_cache_file=dict(required=False, default=None)
     ))
 
     module = AnsibleModule(
@@ -61,9 +67,10 @@ def run_module():
     if module.check_mode:
         module.exit_json(msg=f"engagement_strategy has been set to {engagement_strategy} ! - (dry run mode)", changed=True)
 
-    result = client.wrap_call("GET", f"/dedicated/server/{service_name}/serviceInfos")
-
-    service_id = result["serviceId"]
+    services = ServicesIndex(client, "/dedicated/server/{serviceName}", module.params['services_cache_file'])
+    service_id = services.service_id(service_name)
+    if service_id is None:
+        module.fail_json(msg=f"No service found for {service_name}")
 
     service = client.wrap_call("GET", f"/services/{service_id}")
 
@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: dedicated_server_facts
+short_description: Gather the facts of a dedicated server
+description:
+    - Gather the details of an OVH dedicated server, its hardware, network and IP specifications as facts.
+    - The requested parts are fetched concurrently, replacing the dedicated_server_info, dedicated_server_hardware_info,
+      dedicated_server_network_info and dedicated_server_ip_info tasks.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    service_name:
+        required: true
+        description: The service_name
+    gather_subset:
+        required: false
+        type: list
+        default: ['server', 'hardware', 'network', 'ip']
+        choices: ['server', 'hardware', 'network', 'ip']
+        description:
+            - Parts of the facts to gather
+            - C(server) is /dedicated/server/{serviceName}, the others are its /specifications/*
+'''
+
+EXAMPLES = r'''
+- name: Gather the facts of the server
+  synthesio.ovh.dedicated_server_facts:
+    service_name: "{{ ovhname }}"
+  delegate_to: localhost
+
+- name: Print the datacenter and the model of the server
+  debug:
+    msg: "{{ ovh_dedicated_server.server.datacenter }} {{ ovh_dedicated_server.hardware.description }}"
+
+- name: Gather only the network facts
+  synthesio.ovh.dedicated_server_facts:
+    service_name: "{{ ovhname }}"
+    gather_subset:
+      - network
+  delegate_to: localhost
+'''
+
+RETURN = '''
+ansible_facts:
+    description: Facts of the server.
+    returned: always
+    type: dict
+    contains:
+        ovh_dedicated_server:
+            description:
+                - The requested parts, as returned by dedicated_server_info (server), dedicated_server_hardware_info
+                  (hardware), dedicated_server_network_info (network) and dedicated_server_ip_info (ip).
+            type: dict
+            sample: {"server": {"datacenter": "gra3", "state": "ok"}, "hardware": {"description": "ADV-1"}}
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEDICATED_SERVER_FACT_PATHS,
+    OVH,
+    ovh_argument_spec,
+)
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        service_name=dict(required=True),
+        gather_subset=dict(required=False, type="list", elements="str", default=list(DEDICATED_SERVER_FACT_PATHS),
+                           choices=list(DEDICATED_SERVER_FACT_PATHS)),
+    ))
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    client = OVH(module)
+
+    service_name = module.params['service_name']
+    subsets = list(dict.fromkeys(module.params['gather_subset']))
+
+    results = client.wrap_calls([
+        ("GET", f"/dedicated/server/{service_name}{DEDICATED_SERVER_FACT_PATHS[subset]}", {})
+        for subset in subsets
+    ])
+
+    module.exit_json(changed=False, ansible_facts=dict(ovh_dedicated_server=dict(zip(subsets, results))))
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
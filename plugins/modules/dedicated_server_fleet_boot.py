@@ -0,0 +1,264 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: dedicated_server_fleet_boot
+short_description: Change the boot of many dedicated servers, reboot them and wait for the reboots
+description:
+    - Set the boot of a list of dedicated servers, reboot them and wait until the reboots are done,
+      replacing dedicated_server_boot with force_reboot and dedicated_server_boot_wait for each server.
+    - The boots are set and the reboots launched concurrently, with at most C(max_workers) calls at the same time.
+    - The reboot tasks returned by the API are all waited for at once, with an adaptive backoff.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    service_names:
+        required: true
+        type: list
+        description: The servers to manage
+    boot:
+        required: true
+        choices: ['harddisk','rescue-customer','rescue12-customer','ipxe-shell','poweroff']
+        description:
+            - Which way you want to boot the dedicated servers
+    reboot:
+        required: false
+        type: bool
+        default: true
+        description: Reboot the servers, even if their boot was already set
+    wait:
+        required: false
+        type: bool
+        default: true
+        description: Wait for the reboots to be done
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of API calls running at the same time
+    fail_on_error:
+        required: false
+        type: bool
+        default: true
+        description: Fail if a server could not be set, rebooted, or its reboot is not done at the end of the wait
+    cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the netboots of the servers, see dedicated_server_boot
+            - The servers whose requested boot is not found in their cached netboots are read again
+    cache_flush:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Remove the cached netboots of the servers, and the netboot catalogs they share, before reading them
+            - The other entries of C(cache_file) are kept
+    max_retry:
+        required: false
+        description:
+            - Number of retry
+            - Without C(timeout), the maximum wait time is C(max_retry) x C(sleep)
+        default: 240
+    sleep:
+        required: false
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff while no reboot completes
+        default: 10
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description: Maximum time in seconds to wait
+'''
+
+EXAMPLES = r'''
+- name: Put the servers in rescue mode
+  synthesio.ovh.dedicated_server_fleet_boot:
+    service_names: "{{ groups['ceph'] | map('extract', hostvars, 'ovhname') | list }}"
+    boot: "rescue-customer"
+    max_workers: 20
+    timeout: 900
+  delegate_to: localhost
+  run_once: true
+  register: rescue
+'''
+
+RETURN = '''
+servers:
+    description: Outcome of each server, with the duration of its reboot in seconds.
+    returned: always
+    type: list
+    sample: [{"service_name": "ns12345.ip-1-2-3.eu", "boot": "rescue-customer", "boot_changed": true,
+              "task_id": 123456, "status": "done", "duration": 182.3, "error": null}]
+summary:
+    description: Number of servers by final status.
+    returned: always
+    type: dict
+    sample: {"done": 99, "ovhError": 1}
+polling:
+    description: Polling statistics of the wait.
+    returned: always
+    type: dict
+    sample: {"polls": 12, "elapsed": 240.1, "slept": 231.5, "last_interval": 30.0}
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEFAULT_MAX_WORKERS,
+    OVH,
+    ImmutableCache,
+    Waiter,
+    count_statuses,
+    exit_with_servers,
+    netboots,
+    ovh_argument_spec,
+    ovh_cache_argument_spec,
+    ovh_wait_argument_spec,
+    submit_and_wait_tasks,
+)
+
+
+def run_calls(client, servers, build_call, max_workers):
+    """
+    Run a call for each server concurrently, and mark the servers whose call failed.
+    Returns the results of the servers whose call succeeded.
+    """
+    results = client.wrap_calls([build_call(server) for server in servers], max_workers=max_workers, return_errors=True)
+    succeeded = []
+    for server, result in zip(servers, results):
+        if isinstance(result, Exception):
+            server['status'] = "failed"
+            server['error'] = str(result)
+        else:
+            succeeded.append((server, result))
+    return succeeded
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        service_names=dict(required=True, type="list", elements="str"),
+        boot=dict(
+            required=True,
+            choices=["harddisk", "rescue-customer", "rescue12-customer", "ipxe-shell", "poweroff"],
+        ),
+        reboot=dict(required=False, type="bool", default=True),
+        wait=dict(required=False, type="bool", default=True),
+        max_workers=dict(required=False, type="int", default=DEFAULT_MAX_WORKERS),
+        fail_on_error=dict(required=False, type="bool", default=True),
+    ))
+    module_args.update(ovh_cache_argument_spec(validate=False))
+    module_args.update(ovh_wait_argument_spec())
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    client = OVH(module)
+
+    service_names = module.params['service_names']
+    boot = module.params['boot']
+    reboot = module.params['reboot']
+    wait = module.params['wait']
+    max_workers = module.params['max_workers']
+    fail_on_error = module.params['fail_on_error']
+
+    # Only the netboot entries are flushed, the cache file may be shared with other resources
+    cache = ImmutableCache.from_params(
+        client,
+        module.params,
+        prefix=tuple(f"/dedicated/server/{service_name}/boot" for service_name in service_names) + ("netboot/",),
+    )
+    bootids = netboots(client, cache, service_names, max_workers=max_workers)
+    outdated = [service_name for service_name in service_names if boot not in bootids[service_name]]
+    if outdated and module.params['cache_file']:
+        # The cached netboots may be outdated
+        cache.flush(tuple(f"/dedicated/server/{service_name}/boot" for service_name in outdated))
+        bootids.update(netboots(client, cache, outdated, max_workers=max_workers))
+
+    servers = [
+        dict(service_name=service_name, boot=boot, boot_changed=False, task_id=None,
+             status=None, duration=None, error=None)
+        for service_name in service_names
+    ]
+    for server in servers:
+        if boot not in bootids[server['service_name']]:
+            server['status'] = "failed"
+            server['error'] = f"{boot} is not in the available option: {list(bootids[server['service_name']])}"
+
+    # Only the servers whose boot differs are updated
+    states = run_calls(
+        client,
+        [server for server in servers if server['status'] is None],
+        lambda server: ("GET", f"/dedicated/server/{server['service_name']}", {}),
+        max_workers,
+    )
+    to_update = []
+    for server, state in states:
+        if state['bootId'] != bootids[server['service_name']][boot]:
+            server['boot_changed'] = True
+            to_update.append(server)
+
+    if module.check_mode:
+        for server in servers:
+            if server['status'] is None:
+                server['status'] = "done"
+        module.exit_json(
+            msg=f"{len(to_update)} servers set to boot on {boot}, {len(states) if reboot else 0} rebooted - (dry run mode)",
+            changed=bool(to_update) or (reboot and bool(states)),
+            servers=servers,
+            summary=count_statuses(servers),
+            polling={},
+        )
+
+    run_calls(
+        client,
+        to_update,
+        lambda server: ("PUT", f"/dedicated/server/{server['service_name']}", dict(bootId=bootids[server['service_name']][boot])),
+        max_workers,
+    )
+
+    waiter = Waiter.from_params(module.params)
+    if reboot:
+        # The reboot task is returned by the API, no need to look for it
+        submit_and_wait_tasks(
+            client,
+            waiter,
+            [server for server in servers if server['status'] is None],
+            lambda server: ("POST", f"/dedicated/server/{server['service_name']}/reboot", {}),
+            lambda server: f"/dedicated/server/{server['service_name']}/task/{server['task_id']}",
+            wait=wait,
+            max_workers=max_workers,
+        )
+
+    for server in servers:
+        if server['status'] is None:
+            server['status'] = "done"
+
+    booted = [server for server in servers if server['status'] == "done" or (not wait and server['status'] != "failed")]
+    exit_with_servers(
+        module,
+        servers,
+        f"{len(booted)}/{len(servers)} servers booted on {boot}",
+        changed=any(server['boot_changed'] or server['task_id'] is not None for server in servers),
+        wait=wait,
+        fail_on_error=fail_on_error,
+        polling=waiter.stats(),
+    )
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: dedicated_server_fleet_engagement_strategy
+short_description: Sets the engagement strategy of many dedicated servers
+description:
+    - This module sets the engagement strategy of a list of dedicated servers, or of all the dedicated servers
+      of the account.
+    - The services of the servers are read concurrently, and only the ones whose strategy differs are updated,
+      concurrently.
+    - See dedicated_server_engagement_strategy for the possible strategies.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    engagement_strategy:
+        required: true
+        description:
+            - The engagement strategy rule to apply
+    service_names:
+        required: false
+        type: list
+        description:
+            - The servers to manage. All the dedicated servers of the account by default
+    ending_before:
+        required: false
+        description:
+            - Only manage the engagements ending before this date (YYYY-MM-DD)
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of API calls running at the same time
+    services_cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the serviceId of the servers, see dedicated_server_engagement_strategy
+'''
+
+EXAMPLES = r'''
+- name: "Cancel the servers whose engagement ends this year"
+  synthesio.ovh.dedicated_server_fleet_engagement_strategy:
+    engagement_strategy: "CANCEL_SERVICE"
+    ending_before: "2027-01-01"
+  delegate_to: localhost
+  run_once: true
+  register: engagements
+'''
+
+RETURN = '''
+services:
+    description: Engagement of each server, and its outcome.
+    returned: always
+    type: list
+    sample: [{"service_name": "ns12345.ip-1-2-3.eu", "service_id": 123456, "end_date": "2026-12-01",
+              "strategy_before": "REACTIVATE_ENGAGEMENT", "strategy_after": "CANCEL_SERVICE", "status": "changed",
+              "error": null}]
+summary:
+    description: Number of servers by outcome (changed, unchanged, no_engagement, out_of_range, unavailable, failed).
+    returned: always
+    type: dict
+    sample: {"changed": 42, "unchanged": 250, "no_engagement": 8}
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEFAULT_MAX_WORKERS,
+    OVH,
+    ServicesIndex,
+    count_statuses,
+    ovh_argument_spec,
+)
+
+
+def plan_service(service_name, service, engagement_strategy, ending_before):
+    """
+    Outcome of a server before any update: changed when its strategy must be updated.
+    """
+    result = dict(service_name=service_name, service_id=None, end_date=None,
+                  strategy_before=None, strategy_after=None, status=None, error=None)
+    if service is None:
+        result.update(status="failed", error=f"No service found for {service_name}")
+        return result
+
+    result['service_id'] = service['serviceId']
+    engagement = service['billing']['engagement']
+    if engagement is None:
+        result['status'] = "no_engagement"
+        return result
+
+    end_rule = engagement['endRule']
+    result['end_date'] = engagement.get('endDate')
+    result['strategy_before'] = result['strategy_after'] = end_rule['strategy']
+    if ending_before and (result['end_date'] is None or result['end_date'][:10] >= ending_before):
+        result['status'] = "out_of_range"
+    elif end_rule['strategy'] == engagement_strategy:
+        result['status'] = "unchanged"
+    elif engagement_strategy not in end_rule['possibleStrategies']:
+        result.update(status="unavailable",
+                      error=f"Strategy {engagement_strategy} not available, possible strategies: {end_rule['possibleStrategies']}")
+    else:
+        result.update(status="changed", strategy_after=engagement_strategy)
+    return result
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        engagement_strategy=dict(required=True),
+        service_names=dict(required=False, type="list", elements="str", default=None),
+        ending_before=dict(required=False, default=None),
+        max_workers=dict(required=False, type="int", default=DEFAULT_MAX_WORKERS),
+        services_cache_file=dict(required=False, default=None),
+    ))
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    client = OVH(module)
+
+    engagement_strategy = module.params['engagement_strategy']
+    service_names = module.params['service_names']
+    ending_before = module.params['ending_before']
+    max_workers = module.params['max_workers']
+
+    index = ServicesIndex(client, "/dedicated/server/{serviceName}", module.params['services_cache_file'], max_workers)
+    services = index.services(service_names)
+    if service_names is None:
+        service_names = sorted(services)
+
+    results = [
+        plan_service(service_name, services.get(service_name), engagement_strategy, ending_before)
+        for service_name in service_names
+    ]
+    to_update = [result for result in results if result['status'] == "changed"]
+
+    if not module.check_mode:
+        updates = client.wrap_calls(
+            [
+                ("PUT", f"/services/{result['service_id']}/billing/engagement/endRule", dict(strategy=engagement_strategy))
+                for result in to_update
+            ],
+            max_workers=max_workers,
+            return_errors=True,
+        )
+        for result, update in zip(to_update, updates):
+            if isinstance(update, Exception):
+                result.update(status="failed", strategy_after=result['strategy_before'], error=str(update))
+
+    summary = count_statuses(results)
+
+    changed = any(result['status'] == "changed" for result in results)
+    message = f"engagement_strategy set to {engagement_strategy} for {summary.get('changed', 0)}/{len(results)} servers"
+    if module.check_mode:
+        message = f"{message} - (dry run mode)"
+
+    errors = [result for result in results if result['error']]
+    if errors:
+        module.fail_json(
+            msg=f"{message}, errors: {[(result['service_name'], result['error']) for result in errors]}",
+            changed=changed,
+            services=results,
+            summary=summary,
+        )
+
+    module.exit_json(msg=message, changed=changed, services=results, summary=summary)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: dedicated_server_fleet_info
+short_description: Retrieve the details of many dedicated servers at once
+description:
+    - Retrieve the server, hardware, network and IP details of a list of dedicated servers, or of all
+      the dedicated servers of the account, in a single module run.
+    - The details are fetched concurrently, with at most C(max_workers) calls at the same time.
+    - For large fleets, the details are written as one JSON line per server to C(output_file) and only a summary
+      is returned.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    service_names:
+        required: false
+        type: list
+        description: Servers to retrieve. All the dedicated servers of the account by default
+    gather_subset:
+        required: false
+        type: list
+        default: ['server', 'hardware', 'network', 'ip']
+        choices: ['server', 'hardware', 'network', 'ip']
+        description:
+            - Parts of the details to retrieve
+            - C(server) is /dedicated/server/{serviceName}, the others are its /specifications/*
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of API calls running at the same time
+    output_file:
+        required: false
+        description:
+            - Path of a NDJSON file, where the details of each server are written as they are fetched
+            - When set, the details are not returned by the module
+    cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the hardware specifications of the servers, which never change
+            - Cached entries have no expiration, the hardware of the cached servers is read without any API call
+    cache_flush:
+        required: false
+        type: bool
+        default: false
+        description: Remove the cached hardware of the servers before reading it
+    cache_validate:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Read again the cached hardware of the servers reinstalled or which had an intervention since it was cached
+            - It costs two API calls for each server
+'''
+
+EXAMPLES = r'''
+- name: Retrieve the details of the whole fleet
+  synthesio.ovh.dedicated_server_fleet_info:
+    output_file: "/tmp/ovh_fleet.ndjson"
+    cache_file: "~/.cache/ovh/immutable.json"
+    max_workers: 20
+  delegate_to: localhost
+  run_once: true
+  register: fleet
+
+- name: Retrieve the hardware of some servers
+  synthesio.ovh.dedicated_server_fleet_info:
+    service_names: "{{ groups['ceph'] | map('extract', hostvars, 'ovhname') | list }}"
+    gather_subset:
+      - hardware
+  delegate_to: localhost
+  run_once: true
+  register: ceph_hardware
+'''
+
+RETURN = '''
+servers:
+    description:
+        - Details of each server, by part, with the error of the parts which could not be retrieved.
+        - Not returned when C(output_file) is set.
+    returned: when output_file is not set
+    type: list
+    sample: [{"service_name": "ns12345.ip-1-2-3.eu", "server": {"datacenter": "gra3", "state": "ok"},
+              "hardware": {"description": "ADV-1"}, "errors": {}}]
+summary:
+    description: Number of servers, of servers with errors, and number of servers by datacenter, state and model.
+    returned: always
+    type: dict
+    sample: {"servers": 300, "errors": 1, "datacenter": {"gra3": 200, "rbx8": 100},
+             "state": {"ok": 299, "error": 1}, "model": {"ADV-1": 300}}
+output_file:
+    description: Path of the NDJSON file holding the details of each server.
+    returned: when output_file is set
+    type: str
+'''
+
+import json
+import os
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEDICATED_SERVER_FACT_PATHS,
+    DEFAULT_MAX_WORKERS,
+    OVH,
+    ImmutableCache,
+    hardware_model,
+    ovh_argument_spec,
+    ovh_cache_argument_spec,
+    server_generations,
+)
+
+# Number of servers fetched before their details are written to the output file
+CHUNK_SIZE = 100
+
+
+def fetch_details(client, cache, service_names, subsets, max_workers, validate=False):
+    """
+    Details of the servers, fetched concurrently.
+    The hardware specifications, which never change, are read from the cache when present.
+    With validate, they are only read from the cache when the server was not reinstalled
+    and had no intervention since they were cached.
+    """
+    paths = [
+        (service_name, subset, f"/dedicated/server/{service_name}{DEDICATED_SERVER_FACT_PATHS[subset]}")
+        for service_name in service_names
+        for subset in subsets
+    ]
+    generations = {}
+    if validate and "hardware" in subsets:
+        generations = server_generations(client, service_names, max_workers)
+    to_fetch = [
+        path for service_name, subset, path in paths
+        if subset != "hardware" or not cache.contains(path, generations.get(service_name))
+    ]
+    results = dict(zip(
+        to_fetch,
+        client.wrap_calls([("GET", path, {}) for path in to_fetch], max_workers=max_workers, return_errors=True),
+    ))
+
+    details = {service_name: dict(service_name=service_name, errors={}) for service_name in service_names}
+    for service_name, subset, path in paths:
+        server = details[service_name]
+        result = results[path] if path in results else cache.value(path)
+        if isinstance(result, Exception):
+            server['errors'][subset] = str(result)
+            server[subset] = None
+        else:
+            server[subset] = result
+            if subset == "hardware" and path in results:
+                cache.store(path, result, generations.get(service_name))
+    cache.save()
+    return list(details.values())
+
+
+def count(summary, key, value):
+    if value is not None:
+        summary[key][value] = summary[key].get(value, 0) + 1
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        service_names=dict(required=False, type="list", elements="str", default=None),
+        gather_subset=dict(required=False, type="list", elements="str", default=list(DEDICATED_SERVER_FACT_PATHS),
+                           choices=list(DEDICATED_SERVER_FACT_PATHS)),
+        max_workers=dict(required=False, type="int", default=DEFAULT_MAX_WORKERS),
+        output_file=dict(required=False, type="str", default=None),
+    ))
+    module_args.update(ovh_cache_argument_spec())
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    client = OVH(module)
+
+    service_names = module.params['service_names']
+    subsets = module.params['gather_subset']
+    max_workers = module.params['max_workers']
+    output_file = module.params['output_file']
+    validate = module.params['cache_validate']
+
+    if service_names is None:
+        service_names = client.wrap_call("GET", "/dedicated/server")
+    # Only the hardware of the servers is flushed, the cache file may be shared with other resources
+    cache = ImmutableCache.from_params(
+        client,
+        module.params,
+        prefix=tuple(f"/dedicated/server/{service_name}/specifications/hardware" for service_name in service_names),
+    )
+
+    summary = dict(servers=0, errors=0, datacenter={}, state={}, model={})
+    servers = []
+    output = None
+    if output_file:
+        output_file = os.path.expanduser(output_file)
+        output = open(f"{output_file}.tmp", "w")
+
+    try:
+        # Servers are fetched by chunks, so that the details of a large fleet are written
+        # to the output file as they come instead of being kept in memory
+        for start in range(0, len(service_names), CHUNK_SIZE):
+            for server in fetch_details(
+                client, cache, service_names[start:start + CHUNK_SIZE], subsets, max_workers, validate
+            ):
+                summary['servers'] += 1
+                if server['errors']:
+                    summary['errors'] += 1
+                count(summary, 'datacenter', (server.get('server') or {}).get('datacenter'))
+                count(summary, 'state', (server.get('server') or {}).get('state'))
+                if server.get('hardware'):
+                    count(summary, 'model', hardware_model(server['hardware']))
+
+                if output:
+                    output.write(json.dumps(server) + "\n")
+                else:
+                    servers.append(server)
+    finally:
+        if output:
+            output.close()
+
+    if output:
+        os.replace(f"{output_file}.tmp", output_file)
+        module.exit_json(changed=False, summary=summary, output_file=output_file)
+
+    module.exit_json(changed=False, summary=summary, servers=servers)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
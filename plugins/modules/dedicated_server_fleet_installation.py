@@ -0,0 +1,390 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: dedicated_server_fleet_installation
+short_description: Reinstall a fleet of dedicated servers in rolling waves
+description:
+    - Reinstall many OVH dedicated servers by waves of C(wave_size) servers.
+    - The reinstallations of a wave are launched concurrently, then followed concurrently through their task and
+      the install status endpoint. The next wave starts once the wave is done and has passed the health gate.
+    - The rollout stops when more than C(max_failures) servers failed, the remaining servers are skipped.
+    - With C(check_compatibility), the servers whose hardware does not support C(operating_system) are rejected
+      before any installation is launched.
+    - The documentation for parameters like customizations and storage can be found in the OVH API documentation.
+    - https://eu.api.ovh.com/console/?section=%2Fdedicated%2Fserver&branch=v1#post-/dedicated/server/-serviceName-/reinstall
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    service_names:
+        required: true
+        type: list
+        description: OVH service names of the servers to reinstall (e.g. nsXXXX.ip-XXX)
+    operating_system:
+        required: true
+        description: OS template to use (e.g. debian12_64)
+    customizations:
+        required: false
+        description: Customizations for installation, shared by all the servers
+    server_customizations:
+        required: false
+        type: dict
+        description:
+            - Customizations specific to some servers (e.g. hostname), by service name
+            - They are merged over C(customizations)
+    storage:
+        required: false
+        description: Disk layout config (diskGroupId, RAID, etc.)
+    wave_size:
+        required: false
+        type: int
+        default: 10
+        description: Number of servers reinstalled at the same time
+    max_failures:
+        required: false
+        type: int
+        default: 0
+        description: Number of failed servers tolerated before stopping the rollout
+    health_check:
+        required: false
+        type: bool
+        default: true
+        description: After its installation, a server counts as failed if its state is not C(ok)
+    check_compatibility:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Reject the servers for which C(operating_system) is not a compatible template, before the first wave
+            - The compatible templates are looked up once for each hardware model
+    templates_cache_file:
+        required: false
+        description: Path of a local JSON file caching the compatible templates of each hardware model
+    templates_cache_ttl:
+        required: false
+        type: int
+        default: 86400
+        description: Maximum age in seconds of the compatible templates in the cache
+    cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the hardware of the servers, which never changes, see dedicated_server_hardware_info
+            - With it and C(templates_cache_file), the compatibility check makes no API call once both are warm
+    cache_flush:
+        required: false
+        type: bool
+        default: false
+        description: Remove the cached hardware of the servers before reading it
+    cache_validate:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Read again the cached hardware of a server reinstalled or which had an intervention since it was cached
+            - It costs two API calls for each server
+    max_retry:
+        required: false
+        description:
+            - Number of retry, for each wave
+            - Without C(timeout), the maximum wait time of a wave is C(max_retry) x C(sleep)
+        default: 240
+    sleep:
+        required: false
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff while no installation completes
+        default: 10
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description: Maximum time in seconds to wait for each wave
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of API calls running at the same time
+'''
+
+EXAMPLES = r'''
+- name: Rebuild the fleet, 20 servers at a time
+  synthesio.ovh.dedicated_server_fleet_installation:
+    service_names: "{{ groups['ovh'] | map('extract', hostvars, 'ovhname') | list }}"
+    operating_system: "debian12_64"
+    customizations:
+      sshKey: "{{ lookup('file', '~/.ssh/id_rsa.pub') }}"
+    server_customizations: >-
+      {{ dict(groups['ovh'] | map('extract', hostvars, 'ovhname')
+      | zip(groups['ovh'] | map('community.general.dict_kv', 'hostname'))) }}
+    wave_size: 20
+    max_failures: 3
+    check_compatibility: true
+    templates_cache_file: "~/.cache/ovh/compatible_templates.json"
+    cache_file: "~/.cache/ovh/immutable.json"
+    timeout: 3600
+  delegate_to: localhost
+  run_once: true
+  register: rebuild
+'''
+
+RETURN = '''
+servers:
+    description: Outcome of each server.
+    returned: always
+    type: list
+    sample: [{"service_name": "ns12345.ip-1-2-3.eu", "wave": 1, "task_id": 123456, "status": "done",
+              "step": "Rebooting on hard drive", "duration": 912.4, "error": null}]
+summary:
+    description: Number of servers by outcome (done, failed, timeout, skipped, incompatible).
+    returned: always
+    type: dict
+    sample: {"done": 297, "failed": 1, "skipped": 2}
+polling:
+    description: Polling statistics of each wave.
+    returned: always
+    type: list
+    sample: [{"polls": 24, "elapsed": 1203.1, "slept": 1180.7, "last_interval": 60.0}]
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEFAULT_MAX_WORKERS,
+    OVH,
+    ImmutableCache,
+    OVHError,
+    OVHResourceNotFound,
+    TASK_ERROR_STATUSES,
+    Waiter,
+    compatible_templates,
+    count_statuses,
+    ovh_argument_spec,
+    ovh_cache_argument_spec,
+    ovh_wait_argument_spec,
+)
+import time
+
+
+def launch_wave(client, wave, operating_system, customizations, server_customizations, storage, max_workers):
+    """
+    Launch the reinstallation of every server of the wave concurrently.
+    """
+    calls = []
+    for server in wave:
+        server_custom = dict(customizations or {})
+        server_custom.update(server_customizations.get(server['service_name'], {}))
+        calls.append((
+            "POST",
+            f"/dedicated/server/{server['service_name']}/reinstall",
+            dict(operatingSystem=operating_system, customizations=server_custom or None, storage=storage),
+        ))
+
+    now = time.time()
+    for server, result in zip(wave, client.wrap_calls(calls, max_workers=max_workers, return_errors=True)):
+        if isinstance(result, (OVHError, OVHResourceNotFound)):
+            server['status'] = "failed"
+            server['error'] = str(result)
+        else:
+            server['task_id'] = result.get('taskId')
+            server['status'] = "doing"
+            server['_started'] = now
+
+
+def follow_wave(client, waiter, wave, max_workers):
+    """
+    Follow the installations of the wave until they all ended or the waiter deadline is reached.
+    Each poll reads the tasks of the running installations concurrently, and the install status
+    of those still running to report their current step.
+    """
+    def check():
+        running = [server for server in wave if server['status'] == "doing"]
+        tasks = client.wrap_calls([
+            ("GET", f"/dedicated/server/{server['service_name']}/task/{server['task_id']}", {})
+            for server in running
+        ], max_workers=max_workers, return_errors=True)
+
+        now = time.time()
+        still_running = []
+        for server, task in zip(running, tasks):
+            server['duration'] = round(now - server['_started'], 1)
+            if isinstance(task, (OVHError, OVHResourceNotFound)):
+                server['status'] = "failed"
+                server['error'] = str(task)
+                waiter.progressed()
+            elif task['status'] == "done":
+                server['status'] = "done"
+                waiter.progressed()
+            elif task['status'] in TASK_ERROR_STATUSES:
+                server['status'] = "failed"
+                server['error'] = f"Installation task ended in {task['status']} status"
+                waiter.progressed()
+            else:
+                still_running.append(server)
+
+        statuses = client.wrap_calls([
+            ("GET", f"/dedicated/server/{server['service_name']}/install/status", {})
+            for server in still_running
+        ], max_workers=max_workers, ignore_missing=True, return_errors=True)
+        for server, status in zip(still_running, statuses):
+            if isinstance(status, dict):
+                doing = [progress['comment'] for progress in status['progress'] if progress['status'] == "doing"]
+                if doing and doing[0] != server['step']:
+                    server['step'] = doing[0]
+                    waiter.progressed()
+
+        return not still_running
+
+    if any(server['status'] == "doing" for server in wave):
+        waiter.poll(check)
+
+    for server in wave:
+        if server['status'] == "doing":
+            server['status'] = "timeout"
+            server['error'] = "Max wait time reached"
+
+
+def health_gate(client, wave, max_workers):
+    """
+    Check the state of the freshly installed servers of the wave.
+    """
+    installed = [server for server in wave if server['status'] == "done"]
+    states = client.wrap_calls([
+        ("GET", f"/dedicated/server/{server['service_name']}", {})
+        for server in installed
+    ], max_workers=max_workers, return_errors=True)
+    for server, state in zip(installed, states):
+        if isinstance(state, (OVHError, OVHResourceNotFound)):
+            server['status'] = "failed"
+            server['error'] = f"Health check failed: {state}"
+        elif state.get('state') != "ok":
+            server['status'] = "failed"
+            server['error'] = f"Health check failed: server state is {state.get('state')}"
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        service_names=dict(type="list", elements="str", required=True),
+        operating_system=dict(type="str", required=True),
+        customizations=dict(type="dict", required=False, default=None),
+        server_customizations=dict(type="dict", required=False, default={}),
+        storage=dict(type="list", required=False, default=None),
+        wave_size=dict(type="int", required=False, default=10),
+        max_failures=dict(type="int", required=False, default=0),
+        health_check=dict(type="bool", required=False, default=True),
+        check_compatibility=dict(type="bool", required=False, default=False),
+        templates_cache_file=dict(type="str", required=False, default=None),
+        templates_cache_ttl=dict(type="int", required=False, default=86400),
+        max_workers=dict(type="int", required=False, default=DEFAULT_MAX_WORKERS),
+    ))
+    module_args.update(ovh_cache_argument_spec())
+    module_args.update(ovh_wait_argument_spec())
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    client = OVH(module)
+
+    service_names = module.params['service_names']
+    os_template = module.params['operating_system']
+    customizations = module.params['customizations']
+    server_customizations = module.params['server_customizations'] or {}
+    storage = module.params['storage']
+    wave_size = module.params['wave_size']
+    max_failures = module.params['max_failures']
+    health_check = module.params['health_check']
+    max_workers = module.params['max_workers']
+
+    if wave_size < 1:
+        module.fail_json(msg="wave_size must be at least 1")
+
+    servers = [
+        dict(service_name=service_name, wave=None, task_id=None, status="skipped",
+             step=None, duration=None, error=None)
+        for service_name in service_names
+    ]
+
+    if module.params['check_compatibility']:
+        hardware_cache = ImmutableCache.from_params(
+            client,
+            module.params,
+            prefix=tuple(f"/dedicated/server/{service_name}/specifications/hardware" for service_name in service_names),
+        )
+        templates = compatible_templates(
+            client,
+            service_names,
+            cache_file=module.params['templates_cache_file'],
+            cache_ttl=module.params['templates_cache_ttl'],
+            max_workers=max_workers,
+            hardware_cache=hardware_cache,
+            validate=module.params['cache_validate'],
+        )
+        for server in servers:
+            model, compatible = templates[server['service_name']]
+            if os_template not in compatible:
+                server['status'] = "incompatible"
+                server['error'] = f"Template {os_template} is not compatible with {model}"
+
+    candidates = [server for server in servers if server['status'] != "incompatible"]
+    waves = [candidates[i:i + wave_size] for i in range(0, len(candidates), wave_size)]
+    for index, wave in enumerate(waves):
+        for server in wave:
+            server['wave'] = index + 1
+
+    if module.check_mode:
+        module.exit_json(
+            msg=f"Installation of {len(candidates)} servers ({os_template}) in {len(waves)} waves - (dry run mode)",
+            changed=bool(candidates),
+            servers=servers,
+            summary=count_statuses(servers),
+            polling=[],
+        )
+
+    failures = 0
+    polling = []
+    for wave in waves:
+        if failures > max_failures:
+            break
+
+        launch_wave(client, wave, os_template, customizations, server_customizations, storage, max_workers)
+        waiter = Waiter.from_params(module.params)
+        follow_wave(client, waiter, wave, max_workers)
+        polling.append(waiter.stats())
+        if health_check:
+            health_gate(client, wave, max_workers)
+
+        failures += len([server for server in wave if server['status'] in ("failed", "timeout")])
+
+    for server in servers:
+        server.pop('_started', None)
+    summary = count_statuses(servers)
+
+    changed = any(server['task_id'] is not None for server in servers)
+    message = f"{summary.get('done', 0)}/{len(servers)} servers installed ({os_template})"
+    if failures > max_failures:
+        module.fail_json(
+            msg=f"{message}, rollout stopped after {failures} failures",
+            changed=changed,
+            servers=servers,
+            summary=summary,
+            polling=polling,
+        )
+
+    module.exit_json(msg=message, changed=changed, servers=servers, summary=summary, polling=polling)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
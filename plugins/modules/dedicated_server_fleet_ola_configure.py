@@ -0,0 +1,256 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: dedicated_server_fleet_ola_configure
+short_description: Configure the network interfaces of many servers in OLA mode
+description:
+    - Configure all the network interfaces of a list of servers in an OVHcloud Link Aggregation mode,
+      to switch them to full network private mode (vrack), and wait for the aggregations.
+    - The network interfaces and virtual network interfaces of all the servers are read concurrently,
+      and the servers having an interface linked to a vRack are rejected before any change.
+    - The aggregations are submitted concurrently and their tasks waited for at once.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    service_names:
+        required: true
+        type: list
+        description: OVHcloud names of the servers
+    aggregate_name:
+        required: false
+        default: "bond"
+        description: Name of the aggregate
+    wait:
+        required: false
+        type: bool
+        default: true
+        description: Wait for the aggregation tasks to be done
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of API calls running at the same time
+    fail_on_error:
+        required: false
+        type: bool
+        default: true
+        description: Fail if a server could not be configured, or its task is not done at the end of the wait
+    max_retry:
+        required: false
+        description:
+            - Number of retry
+            - Without C(timeout), the maximum wait time is C(max_retry) x C(sleep)
+        default: 240
+    sleep:
+        required: false
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff while no task completes
+        default: 10
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description: Maximum time in seconds to wait
+'''
+
+EXAMPLES = r'''
+- name: Configure the rack in OLA mode
+  synthesio.ovh.dedicated_server_fleet_ola_configure:
+    service_names: "{{ groups['rack1'] | map('extract', hostvars, 'ovhname') | list }}"
+    aggregate_name: "bond"
+    timeout: 1800
+  delegate_to: localhost
+  run_once: true
+'''
+
+RETURN = '''
+servers:
+    description: Outcome of each server.
+    returned: always
+    type: list
+    sample: [{"service_name": "ns12345.ip-1-2-3.eu", "virtual_network_interfaces": ["a1b2...", "c3d4..."],
+              "task_id": 123456, "status": "done", "duration": 301.2, "error": null}]
+summary:
+    description: Number of servers by final status.
+    returned: always
+    type: dict
+    sample: {"done": 40, "unchanged": 2}
+polling:
+    description: Polling statistics of the wait.
+    returned: always
+    type: dict
+    sample: {"polls": 10, "elapsed": 310.2, "slept": 300.1, "last_interval": 60.0}
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEFAULT_MAX_WORKERS,
+    OVH,
+    Waiter,
+    count_statuses,
+    exit_with_servers,
+    ovh_argument_spec,
+    ovh_wait_argument_spec,
+    submit_and_wait_tasks,
+)
+
+
+def batch_get(client, servers, build_paths, max_workers):
+    """
+    Read several routes for each server in a single concurrent batch.
+    A server with a failed read is marked as failed.
+    Returns the results of each server still pending, in the order of its routes.
+    """
+    pending = [server for server in servers if server['status'] is None]
+    paths = [(server, path) for server in pending for path in build_paths(server)]
+    results = client.wrap_calls([("GET", path, {}) for _, path in paths], max_workers=max_workers, return_errors=True)
+
+    by_server = {server['service_name']: [] for server in pending}
+    for (server, _), result in zip(paths, results):
+        if isinstance(result, Exception):
+            server.update(status="failed", error=str(result))
+        by_server[server['service_name']].append(result)
+    return {server['service_name']: by_server[server['service_name']] for server in pending if server['status'] is None}
+
+
+def discover_interfaces(client, servers, max_workers):
+    """
+    Virtual network interfaces of the servers, validated before any change:
+    a server needs at least two network interfaces, none of them linked to a vRack.
+    The servers already in OLA mode are marked as unchanged.
+    """
+    mac_addresses = batch_get(
+        client, servers, lambda server: [f"/dedicated/server/{server['service_name']}/networkInterfaceController"], max_workers
+    )
+    for server in servers:
+        if server['service_name'] in mac_addresses and len(mac_addresses[server['service_name']][0]) < 2:
+            server.update(
+                status="failed",
+                error=f"{server['service_name']} doesn't have enough interfaces eligible to OLA, "
+                      "please remove vRack association or Additional IPs",
+            )
+
+    controllers = batch_get(
+        client,
+        servers,
+        lambda server: [
+            f"/dedicated/server/{server['service_name']}/networkInterfaceController/{mac_address}"
+            for mac_address in mac_addresses[server['service_name']][0]
+        ],
+        max_workers,
+    )
+    for server in servers:
+        if server['service_name'] in controllers:
+            # Remove duplicate entries for Baremetal servers with 4 NICs
+            server['virtual_network_interfaces'] = list(dict.fromkeys(
+                controller['virtualNetworkInterface'] for controller in controllers[server['service_name']]
+            ))
+
+    interfaces = batch_get(
+        client,
+        servers,
+        lambda server: [
+            f"/dedicated/server/{server['service_name']}/virtualNetworkInterface/{uuid}"
+            for uuid in server['virtual_network_interfaces']
+        ],
+        max_workers,
+    )
+    for server in servers:
+        details = interfaces.get(server['service_name'], [])
+        # A single aggregated interface: the server is already in OLA mode, possibly linked to a vRack
+        if len(details) == 1 and details[0].get('mode', '').endswith("_aggregation"):
+            server['status'] = "unchanged"
+            continue
+        for interface in details:
+            if interface['vrack'] is not None:
+                server.update(
+                    status="failed",
+                    error=f"{interface['name']} on {server['service_name']} is linked to a vRack, please remove vRack association first",
+                )
+                break
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        service_names=dict(required=True, type="list", elements="str"),
+        aggregate_name=dict(required=False, default="bond"),
+        wait=dict(required=False, type="bool", default=True),
+        max_workers=dict(required=False, type="int", default=DEFAULT_MAX_WORKERS),
+        fail_on_error=dict(required=False, type="bool", default=True),
+    ))
+    module_args.update(ovh_wait_argument_spec())
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    client = OVH(module)
+
+    service_names = module.params['service_names']
+    aggregate_name = module.params['aggregate_name']
+    wait = module.params['wait']
+    max_workers = module.params['max_workers']
+    fail_on_error = module.params['fail_on_error']
+
+    servers = [
+        dict(service_name=service_name, virtual_network_interfaces=[], task_id=None,
+             status=None, duration=None, error=None)
+        for service_name in service_names
+    ]
+    discover_interfaces(client, servers, max_workers)
+    to_configure = [server for server in servers if server['status'] is None]
+
+    if module.check_mode:
+        for server in to_configure:
+            server['status'] = "done"
+        module.exit_json(
+            msg=f"OLA configuration of {len(to_configure)}/{len(servers)} servers with aggregate name {aggregate_name} - (dry run mode)",
+            changed=bool(to_configure),
+            servers=servers,
+            summary=count_statuses(servers),
+            polling={},
+        )
+
+    waiter = Waiter.from_params(module.params)
+    submitted = submit_and_wait_tasks(
+        client,
+        waiter,
+        to_configure,
+        lambda server: (
+            "POST",
+            f"/dedicated/server/{server['service_name']}/ola/aggregation",
+            dict(name=aggregate_name, virtualNetworkInterfaces=server['virtual_network_interfaces']),
+        ),
+        lambda server: f"/dedicated/server/{server['service_name']}/task/{server['task_id']}",
+        wait=wait,
+        max_workers=max_workers,
+    )
+
+    exit_with_servers(
+        module,
+        servers,
+        f"OLA configuration of {len(submitted)}/{len(servers)} servers with aggregate name {aggregate_name}",
+        changed=bool(submitted),
+        wait=wait,
+        fail_on_error=fail_on_error,
+        polling=waiter.stats(),
+    )
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
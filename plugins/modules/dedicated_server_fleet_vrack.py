@@ -0,0 +1,242 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: dedicated_server_fleet_vrack
+short_description: Add or remove many dedicated servers from a vrack
+description:
+    - Add or remove a list of dedicated servers from a vrack, in a single task.
+    - The network generation of the servers is detected concurrently, the membership of the vrack is read once,
+      then the additions or removals are submitted concurrently and the vrack tasks waited for at once.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    service_names:
+        required: true
+        type: list
+        description: The servers to manage
+    vrack:
+        required: true
+        description: The vrack name
+    state:
+        required: false
+        default: present
+        choices: ['present', 'absent']
+        description: Indicate the desired state of the servers in the vrack
+    wait:
+        required: false
+        type: bool
+        default: true
+        description: Wait for the vrack tasks to be done
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of API calls running at the same time
+    fail_on_error:
+        required: false
+        type: bool
+        default: true
+        description: Fail if a server could not be added or removed, or its task is not done at the end of the wait
+    max_retry:
+        required: false
+        description:
+            - Number of retry
+            - Without C(timeout), the maximum wait time is C(max_retry) x C(sleep)
+        default: 120
+    sleep:
+        required: false
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff while no task completes
+        default: 5
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description: Maximum time in seconds to wait
+'''
+
+EXAMPLES = r'''
+- name: Add the rack to the vrack
+  synthesio.ovh.dedicated_server_fleet_vrack:
+    service_names: "{{ groups['rack1'] | map('extract', hostvars, 'ovhname') | list }}"
+    vrack: "{{ vrack }}"
+  delegate_to: localhost
+  run_once: true
+'''
+
+RETURN = '''
+servers:
+    description: Outcome of each server.
+    returned: always
+    type: list
+    sample: [{"service_name": "ns12345.ip-1-2-3.eu", "generation": "new", "interface": "a1b2c3d4-...",
+              "action": "add", "task_id": 123456, "status": "done", "duration": 42.1, "error": null}]
+summary:
+    description: Number of servers by final status.
+    returned: always
+    type: dict
+    sample: {"done": 198, "unchanged": 2}
+polling:
+    description: Polling statistics of the wait.
+    returned: always
+    type: dict
+    sample: {"polls": 8, "elapsed": 95.2, "slept": 90.4, "last_interval": 22.5}
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEFAULT_MAX_WORKERS,
+    OVH,
+    Waiter,
+    count_statuses,
+    exit_with_servers,
+    ovh_argument_spec,
+    ovh_wait_argument_spec,
+    submit_and_wait_tasks,
+)
+
+
+def detect_generations(client, servers, max_workers):
+    """
+    Network generation of the servers, see dedicated_server_vrack.
+    A server on a new generation has a virtual network interface in vrack mode,
+    or in vrack_aggregation mode for the servers with several interfaces on the same link.
+    """
+    pending = list(servers)
+    for mode in ("vrack", "vrack_aggregation"):
+        interfaces = client.wrap_calls(
+            [("GET", f"/dedicated/server/{server['service_name']}/virtualNetworkInterface", dict(mode=mode))
+             for server in pending],
+            max_workers=max_workers,
+            return_errors=True,
+        )
+        still_pending = []
+        for server, interface in zip(pending, interfaces):
+            if isinstance(interface, Exception):
+                server.update(status="failed", error=str(interface))
+            elif interface:
+                server.update(generation="new", interface="".join(interface))
+            else:
+                still_pending.append(server)
+        pending = still_pending
+
+    for server in pending:
+        server['generation'] = "old"
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        service_names=dict(required=True, type="list", elements="str"),
+        vrack=dict(required=True),
+        state=dict(choices=['present', 'absent'], default='present'),
+        wait=dict(required=False, type="bool", default=True),
+        max_workers=dict(required=False, type="int", default=DEFAULT_MAX_WORKERS),
+        fail_on_error=dict(required=False, type="bool", default=True),
+    ))
+    module_args.update(ovh_wait_argument_spec(max_retry=120, sleep=5))
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    client = OVH(module)
+
+    service_names = module.params['service_names']
+    vrack = module.params['vrack']
+    state = module.params['state']
+    wait = module.params['wait']
+    max_workers = module.params['max_workers']
+    fail_on_error = module.params['fail_on_error']
+
+    servers = [
+        dict(service_name=service_name, generation=None, interface=None, action=None, task_id=None,
+             status=None, duration=None, error=None)
+        for service_name in service_names
+    ]
+    detect_generations(client, servers, max_workers)
+
+    # The membership of the vrack is read once, for each generation in use
+    members = set()
+    if any(server['generation'] == "new" for server in servers):
+        members.update(
+            member['dedicatedServer']
+            for member in client.wrap_call("GET", f"/vrack/{vrack}/dedicatedServerInterfaceDetails")
+        )
+    if any(server['generation'] == "old" for server in servers):
+        members.update(client.wrap_call("GET", f"/vrack/{vrack}/dedicatedServer"))
+
+    calls = {}
+    for server in servers:
+        if server['status'] == "failed":
+            continue
+        if (server['service_name'] in members) == (state == 'present'):
+            server['status'] = "unchanged"
+            continue
+
+        server['action'] = "add" if state == 'present' else "remove"
+        if server['generation'] == "new":
+            if state == 'present':
+                call = ("POST", f"/vrack/{vrack}/dedicatedServerInterface", dict(dedicatedServerInterface=server['interface']))
+            else:
+                call = ("DELETE", f"/vrack/{vrack}/dedicatedServerInterface/{server['interface']}", {})
+        else:
+            if state == 'present':
+                call = ("POST", f"/vrack/{vrack}/dedicatedServer", dict(dedicatedServer=server['service_name']))
+            else:
+                call = ("DELETE", f"/vrack/{vrack}/dedicatedServer/{server['service_name']}", {})
+        calls[server['service_name']] = call
+
+    if module.check_mode:
+        for server in servers:
+            if server['service_name'] in calls:
+                server['status'] = "done"
+        module.exit_json(
+            msg=f"{len(calls)}/{len(servers)} servers {state} on {vrack} - (dry run mode)",
+            changed=bool(calls),
+            servers=servers,
+            summary=count_statuses(servers),
+            polling={},
+        )
+
+    waiter = Waiter.from_params(module.params)
+    # vrack tasks are deleted once done
+    submitted = submit_and_wait_tasks(
+        client,
+        waiter,
+        [server for server in servers if server['service_name'] in calls],
+        lambda server: calls[server['service_name']],
+        lambda server: f"/vrack/{vrack}/task/{server['task_id']}",
+        wait=wait,
+        task_id_key="id",
+        missing_status="done",
+        max_workers=max_workers,
+    )
+
+    exit_with_servers(
+        module,
+        servers,
+        f"{len(submitted)}/{len(servers)} servers {state} on {vrack}",
+        changed=bool(submitted),
+        wait=wait,
+        fail_on_error=fail_on_error,
+        polling=waiter.stats(),
+    )
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,23 @@ options:
     service_name:
         required: true
         description: The service_name
+    cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the hardware specifications, which never change
+            - Cached entries have no expiration
+    cache_flush:
+        required: false
+        type: bool
+        default: false
+        description: Remove the cached entries of the server before reading them
+    cache_validate:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Read again the cached entries if the server was reinstalled or had an intervention since they were cached
+            - It costs two API calls
 """
 EXAMPLES = r"""
 - name: Retrieve hardware specifications for an OVH dedicated server
@@ -24,6 +41,13 @@ EXAMPLES = r"""
     service_name: "{{ service_name }}"
   delegate_to: localhost
   register: hardware_info
+
+- name: Retrieve hardware specifications from a local cache
+  synthesio.ovh.dedicated_server_hardware_info:
+    service_name: "{{ service_name }}"
+    cache_file: "~/.cache/ovh/immutable.json"
+  delegate_to: localhost
+  register: hardware_info
 """
 RETURN = r"""
 bootMode:
@@ -178,13 +202,17 @@ usbKeys:
             type: int"""
 from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
     OVH,
+    ImmutableCache,
     ovh_argument_spec,
+    ovh_cache_argument_spec,
+    server_generation,
 )
 
 
 def run_module():
     module_args = ovh_argument_spec()
     module_args.update(dict(service_name=dict(required=True)))
+    module_args.update(ovh_cache_argument_spec())
     module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
 
     if module.check_mode:
@@ -192,9 +220,9 @@ def run_module():
 
     client = OVH(module)
     service_name = module.params["service_name"]
-    result = client.wrap_call(
-        "GET", f"/dedicated/server/{service_name}/specifications/hardware"
-    )
+    cache = ImmutableCache.from_params(client, module.params, prefix=f"/dedicated/server/{service_name}/")
+    generation = server_generation(client, service_name) if module.params["cache_validate"] else None
+    result = cache.get(f"/dedicated/server/{service_name}/specifications/hardware", generation)
     module.exit_json(changed=False, **result)
 
 
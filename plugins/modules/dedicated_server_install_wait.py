@@ -13,6 +13,10 @@ short_description: Wait until the dedicated server installation is done
 description:
     - Wait until the dedicated server installation is done
     - Can be used to wait before running next task in your playbook
+    - The poll interval follows the duration of the installation steps already done
+    - With C(history_file), the duration of each step is recorded by OS template and hardware model.
+      Later waits use it to predict the end of the installation, to poll around the expected
+      step transitions, and to flag installations much slower than usual.
 author: Synthesio SRE Team
 requirements:
     - ovh >= 0.5.0
@@ -20,14 +24,69 @@ options:
     service_name:
         required: true
         description: Ovh name of the server
+    task_id:
+        required: false
+        description:
+            - Id of the installation task, as returned by dedicated_server_installation
+            - If not set, the last reinstallServer task of the server is used
+    history_file:
+        required: false
+        description:
+            - Path of a local JSON file where the installation durations are recorded and read from
+            - The history is disabled when not set
+    operating_system:
+        required: false
+        description:
+            - OS template being installed, used to key the history
+            - If not set, it is read from the server
+    cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the hardware of the server, used to key the history,
+              see dedicated_server_hardware_info
+    cache_flush:
+        required: false
+        type: bool
+        default: false
+        description: Remove the cached hardware of the server before reading it
+    cache_validate:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Read again the cached hardware if the server was reinstalled or had an intervention since it was cached
+            - It costs two API calls
+    anomaly_factor:
+        required: false
+        type: float
+        default: 3
+        description:
+            - An installation, or one of its steps, is flagged as slow when it lasts more than
+              C(anomaly_factor) times its median duration in the history
+    fail_on_anomaly:
+        required: false
+        type: bool
+        default: false
+        description: Fail as soon as the installation is flagged as slow, instead of only warning
     max_retry:
         required: false
-        description: Number of retry
+        description:
+            - Number of retry
+            - Without C(timeout), the maximum wait time is C(max_retry) x C(sleep)
         default: 240
     sleep:
         required: false
-        description: Time to sleep between retries
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff while nothing progresses
         default: 10
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description: Maximum time in seconds to wait
 
 '''
 
@@ -38,21 +97,198 @@ EXAMPLES = r'''
     max_retry: "240"
     sleep: "10"
   delegate_to: localhost
+
+- name: Install new dedicated server
+  synthesio.ovh.dedicated_server_installation:
+    service_name: "ns12345.ip-1-2-3.eu"
+    operating_system: "debian12_64"
+  delegate_to: localhost
+  register: installation
+
+- name: Wait for this installation
+  synthesio.ovh.dedicated_server_install_wait:
+    service_name: "ns12345.ip-1-2-3.eu"
+    task_id: "{{ installation.task_id }}"
+    history_file: "~/.ansible/ovh_install_history.json"
+    operating_system: "debian12_64"
+  delegate_to: localhost
 '''
 
-RETURN = ''' # '''
+RETURN = '''
+task_id:
+    description: Id of the installation task waited for.
+    returned: always
+    type: int
+steps:
+    description:
+        - Timeline of the installation steps.
+        - started is the number of seconds since the start of the wait when the step was first seen in progress,
+          duration the number of seconds the step has been seen in progress. Both are null for steps done before the wait.
+        - For a step already in progress at the start of the wait, duration is only a lower bound and is not recorded in the history.
+    returned: always
+    type: list
+    sample: [{"step": "Setting up partitions", "status": "done", "started": 12.3, "duration": 45.1}]
+eta:
+    description:
+        - Prediction from the history, null without history for this OS template and hardware model.
+        - predicted is the median duration of the installation, remaining the time left at the last poll.
+    returned: always
+    type: dict
+    sample: {"key": "debian12_64|ADVANCE-1 | AMD EPYC 4244P", "samples": 12, "predicted": 912.0, "remaining": 0}
+anomalies:
+    description: Installation or steps flagged as slow compared to the history.
+    returned: always
+    type: list
+    sample: ["Step Setting up partitions lasts 410s, median is 45s"]
+polling:
+    description: Polling statistics of the wait.
+    returned: always
+    type: dict
+    sample: {"polls": 12, "elapsed": 423.5, "slept": 418.2, "last_interval": 60.0}
+'''
 
-from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, OVHResourceNotFound, ovh_argument_spec
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    OVH,
+    ImmutableCache,
+    OVHResourceNotFound,
+    TASK_ERROR_STATUSES,
+    Waiter,
+    hardware_model,
+    hardware_specifications,
+    ovh_argument_spec,
+    ovh_cache_argument_spec,
+    ovh_wait_argument_spec,
+    load_json_store,
+    update_json_store,
+)
+import statistics
 import time
 
+# Number of durations kept in the history for each installation step
+HISTORY_SAMPLES = 20
+
+
+def update_steps(steps, progress, now):
+    """
+    Update the timeline of the installation steps with the last progress status.
+
+    Args:
+        steps: dict of step comment => step timeline, in the order of the installation
+        progress: 'progress' list of /install/status
+        now: time of the poll, relative to the start of the wait
+    """
+    for progress_step in progress:
+        step = steps.setdefault(progress_step['comment'], dict(
+            step=progress_step['comment'], status=None, started=None, duration=None, _ended=None, _partial=False,
+        ))
+        if progress_step['status'] == "doing" and step['started'] is None:
+            step['started'] = now
+            # Already in progress when first seen: its real start is unknown, the duration is only a lower bound
+            step['_partial'] = step['status'] is None
+        elif progress_step['status'] != "doing" and step['status'] == "doing" and step['started'] is not None:
+            step['_ended'] = now
+        step['status'] = progress_step['status']
+        if step['started'] is not None:
+            step['duration'] = round((step['_ended'] or now) - step['started'], 1)
+
+
+def close_steps(steps, now):
+    """
+    End the steps still in progress when the installation task is done, as the task ends with its last step.
+    """
+    for step in steps.values():
+        if step['status'] == "doing" and step['started'] is not None:
+            step['status'] = "done"
+            step['_ended'] = now
+            step['duration'] = round(now - step['started'], 1)
+
+
+def next_poll_hint(steps, now, history):
+    """
+    Estimate when the step in progress should end, from the median duration of this step in the history,
+    or else from the mean duration of the steps fully seen since the start of the wait.
+    None if there is nothing to base it on.
+    """
+    current = [
+        step for step in steps.values()
+        if step['status'] == "doing" and step['started'] is not None and not step['_partial']
+    ]
+    if not current:
+        return None
+    step = current[0]
+
+    if history.get('steps', {}).get(step['step']):
+        expected = statistics.median(history['steps'][step['step']])
+    else:
+        durations = [s['duration'] for s in steps.values() if s['_ended'] is not None and not s['_partial']]
+        if not durations:
+            return None
+        expected = sum(durations) / len(durations)
+    return expected - (now - step['started'])
+
+
+def history_key(client, service_name, operating_system, cache, validate):
+    """
+    Key of the history: the OS template and the hardware model of the server.
+    """
+    if operating_system is None:
+        operating_system = client.wrap_call("GET", f"/dedicated/server/{service_name}").get('os')
+    hardware = hardware_specifications(client, cache, [service_name], validate)[service_name]
+    return f"{operating_system}|{hardware_model(hardware)}"
+
+
+def find_anomalies(steps, now, elapsed_time, history, factor):
+    """
+    Steps in progress, or the whole installation, lasting more than factor times their historical median.
+    Returns a dict of step (None for the whole installation) => message.
+    """
+    anomalies = {}
+    for step in steps.values():
+        samples = history.get('steps', {}).get(step['step'])
+        if step['status'] != "doing" or step['started'] is None or not samples:
+            continue
+        median = statistics.median(samples)
+        if now - step['started'] > factor * median:
+            anomalies[step['step']] = f"Step {step['step']} lasts {int(now - step['started'])}s, median is {int(median)}s"
+
+    if history.get('total') and elapsed_time is not None:
+        median = statistics.median(history['total'])
+        if elapsed_time > factor * median:
+            anomalies[None] = f"Installation lasts {int(elapsed_time)}s, median is {int(median)}s"
+    return anomalies
+
+
+def record_history(history_file, key, steps, total):
+    """
+    Add the durations of the steps fully seen, and the total duration, to the history.
+    The steps already in progress at the first poll are left out, their start was not seen.
+    """
+    def update(content):
+        history = content.setdefault(key, dict(total=[], steps={}))
+        for step in steps.values():
+            if step['_ended'] is not None and not step['_partial']:
+                durations = history['steps'].setdefault(step['step'], [])
+                durations.append(step['duration'])
+                del durations[:-HISTORY_SAMPLES]
+        if total is not None:
+            history['total'].append(round(total, 1))
+            del history['total'][:-HISTORY_SAMPLES]
+
+    update_json_store(history_file, update)
+
 
 def run_module():
     module_args = ovh_argument_spec()
     module_args.update(dict(
         service_name=dict(required=True),
-        max_retry=dict(required=False, default=240),
-        sleep=dict(required=False, default=10)
+        task_id=dict(required=False, default=None),
+        history_file=dict(required=False, default=None),
+        operating_system=dict(required=False, default=None),
+        anomaly_factor=dict(required=False, type="float", default=3),
+        fail_on_anomaly=dict(required=False, type="bool", default=False),
     ))
+    module_args.update(ovh_cache_argument_spec())
+    module_args.update(ovh_wait_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
@@ -61,26 +297,54 @@ def run_module():
     client = OVH(module)
 
     service_name = module.params['service_name']
-    max_retry = module.params['max_retry']
-    sleep = module.params['sleep']
+    history_file = module.params['history_file']
+    anomaly_factor = module.params['anomaly_factor']
+    fail_on_anomaly = module.params['fail_on_anomaly']
+    waiter = Waiter.from_params(module.params)
 
     if module.check_mode:
         module.exit_json(msg="done - (dry run mode)", changed=False)
 
-    for i in range(1, int(max_retry)):
+    task_id = module.params['task_id']
+    if task_id is None:
+        # The installation task is resolved once, its id does not change during the wait
         tasklist = client.wrap_call(
             "GET",
             f"/dedicated/server/{service_name}/task",
             function='reinstallServer')
+        if not tasklist:
+            module.fail_json(msg=f"No reinstallServer task found on {service_name}")
+        task_id = max(tasklist)
+
+    key = None
+    history = dict()
+    if history_file:
+        cache = ImmutableCache.from_params(
+            client, module.params, prefix=f"/dedicated/server/{service_name}/specifications/hardware"
+        )
+        key = history_key(client, service_name, module.params['operating_system'], cache, module.params['cache_validate'])
+        history = load_json_store(history_file).get(key, dict())
+
+    # elapsed_time is the installation time reported by the API, and when it was read
+    state = dict(status=None, elapsed_time=None, read_at=None)
+    steps = dict()
+    anomalies = dict()
+    start = time.monotonic()
+
+    def check():
         result = client.wrap_call(
             "GET",
-            f"/dedicated/server/{service_name}/task/{max(tasklist)}")
+            f"/dedicated/server/{service_name}/task/{task_id}")
+        state['status'] = result['status']
 
-        message = ""
-        # Get more details in installation progression
-        if "done" in result['status']:
-            module.exit_json(msg="{}: {}".format(result['status'], message), changed=False)
+        if result['status'] == "done":
+            # The steps seen in progress at the previous poll ended with the task
+            close_steps(steps, time.monotonic() - start)
+            return True
+        if result['status'] in TASK_ERROR_STATUSES:
+            return True
 
+        # Get more details in installation progression
         try:
             progress_status = client.wrap_call(
                 "GET",
@@ -88,14 +352,76 @@ def run_module():
             )
         except OVHResourceNotFound:
             module.debug('Got 404ed while trying to get the progress status, installation might be done')
-            continue
+            # Check again soon
+            waiter.progressed()
+            return False
+
+        now = time.monotonic() - start
+        current = [step['step'] for step in steps.values() if step['status'] == "doing"]
+        update_steps(steps, progress_status['progress'], now)
+        if progress_status.get('elapsedTime') is not None:
+            state['elapsed_time'] = progress_status['elapsedTime']
+            state['read_at'] = now
+
+        for subject, anomaly in find_anomalies(steps, now, state['elapsed_time'], history, anomaly_factor).items():
+            # Warn once for each slow step
+            if subject not in anomalies:
+                module.warn(anomaly)
+            anomalies[subject] = anomaly
+        if anomalies and fail_on_anomaly:
+            return True
 
         for progress in progress_status['progress']:
             if progress["status"] == "doing":
                 module.debug(msg='Current progress: {}'.format(progress['comment']))
+                # A new step started, poll at the minimum interval again
+                if progress['comment'] not in current:
+                    waiter.progressed()
+
+        # Sleep until the step in progress is expected to end
+        hint = next_poll_hint(steps, now, history)
+        if hint is not None:
+            waiter.hint(hint)
+        return False
+
+    waiter.poll(check)
+
+    timeline = [
+        dict(
+            step=step['step'],
+            status=step['status'],
+            started=None if step['started'] is None else round(step['started'], 1),
+            duration=step['duration'],
+        )
+        for step in steps.values()
+    ]
+    now = time.monotonic() - start
+    total = None
+    if state['elapsed_time'] is not None:
+        total = state['elapsed_time'] + now - state['read_at']
+
+    eta = None
+    if history.get('total'):
+        predicted = statistics.median(history['total'])
+        eta = dict(
+            key=key,
+            samples=len(history['total']),
+            predicted=round(predicted, 1),
+            remaining=0 if state['status'] == "done" else max(0, round(predicted - (total or 0), 1)),
+        )
+
+    if history_file and state['status'] == "done":
+        record_history(history_file, key, steps, total)
 
-        time.sleep(float(sleep))
-    module.fail_json(msg="Max wait time reached, about %i x %i seconds" % (i, int(sleep)))
+    anomalies = list(anomalies.values())
+    result = dict(task_id=task_id, steps=timeline, eta=eta, anomalies=anomalies, polling=waiter.stats())
+    if anomalies and fail_on_anomaly and state['status'] != "done":
+        module.fail_json(msg=f"Installation flagged as slow: {', '.join(anomalies)}", **result)
+    if state['status'] == "done":
+        module.exit_json(msg="{}: ".format(state['status']), changed=False, **result)
+    if state['status'] in TASK_ERROR_STATUSES:
+        module.fail_json(msg=f"Installation ended in {state['status']} status", **result)
+    module.fail_json(msg=f"Max wait time reached, about {waiter.stats()['elapsed']} seconds", **result)
 
 
 def main():
@@ -30,6 +30,40 @@ options:
     storage:
         required: false
         description: Disk layout config (diskGroupId, RAID, etc.)
+    check_compatibility:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Fail before launching the installation if C(operating_system) is not a compatible template of the server
+            - The compatible templates are looked up once for each hardware model
+    templates_cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the compatible templates of each hardware model
+            - With it, only the first server of each model calls /install/compatibleTemplates
+    templates_cache_ttl:
+        required: false
+        type: int
+        default: 86400
+        description: Maximum age in seconds of the compatible templates in the cache
+    cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the hardware of the servers, which never changes, see dedicated_server_hardware_info
+            - With it and C(templates_cache_file), the compatibility check makes no API call once both are warm
+    cache_flush:
+        required: false
+        type: bool
+        default: false
+        description: Remove the cached hardware of the server before reading it
+    cache_validate:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Read again the cached hardware of a server reinstalled or which had an intervention since it was cached
+            - It costs two API calls for each server
 '''
 
 EXAMPLES = r'''
@@ -57,6 +91,15 @@ EXAMPLES = r'''
               mountPoint: /srv
               raidLevel: 0
               size: 0
+
+- name: Reinstall OVH servers, rejecting incompatible templates before any write
+  dedicated_server_installation:
+    service_name: "{{ ovhname }}"
+    operating_system: "debian12_64"
+    check_compatibility: true
+    templates_cache_file: "~/.cache/ovh/compatible_templates.json"
+    cache_file: "~/.cache/ovh/immutable.json"
+  delegate_to: localhost
 '''
 
 RETURN = '''
@@ -66,7 +109,13 @@ task_id:
   type: int
 '''
 
-from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, ovh_argument_spec
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    OVH,
+    ImmutableCache,
+    compatible_templates,
+    ovh_argument_spec,
+    ovh_cache_argument_spec,
+)
 
 
 def run_module():
@@ -75,8 +124,12 @@ def run_module():
         service_name=dict(type="str", required=True),
         operating_system=dict(type="str", required=True),
         customizations=dict(type="dict", required=False, default=None),
-        storage=dict(type="list", required=False, default=None)
+        storage=dict(type="list", required=False, default=None),
+        check_compatibility=dict(type="bool", required=False, default=False),
+        templates_cache_file=dict(type="str", required=False, default=None),
+        templates_cache_ttl=dict(type="int", required=False, default=86400),
     ))
+    module_args.update(ovh_cache_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
@@ -90,6 +143,24 @@ def run_module():
     storage = module.params['storage']
     customizations = module.params['customizations']
 
+    if module.params['check_compatibility']:
+        hardware_cache = ImmutableCache.from_params(
+            client, module.params, prefix=f"/dedicated/server/{service_name}/specifications/hardware"
+        )
+        model, templates = compatible_templates(
+            client,
+            [service_name],
+            cache_file=module.params['templates_cache_file'],
+            cache_ttl=module.params['templates_cache_ttl'],
+            hardware_cache=hardware_cache,
+            validate=module.params['cache_validate'],
+        )[service_name]
+        if os_template not in templates:
+            module.fail_json(
+                msg=f"Template {os_template} is not compatible with {service_name} ({model}), "
+                    f"compatible templates: {templates}"
+            )
+
     if module.check_mode:
         module.exit_json(msg=f"Installation in progress on {service_name} ({os_template}) - (dry run mode)",
                          changed=True)
@@ -0,0 +1,191 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: dedicated_server_properties
+short_description: Set the properties of dedicated servers
+description:
+    - Set any combination of the monitoring, noIntervention, rescueSshKey, bootId and rescueMail
+      properties of one or many dedicated servers.
+    - Each server is read once, and only the properties which differ are updated, in a single call.
+    - With C(service_names), the servers are read and updated concurrently.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    service_name:
+        required: false
+        description: The server to manage
+    service_names:
+        required: false
+        type: list
+        description: The servers to manage, instead of C(service_name)
+    monitoring:
+        required: false
+        type: bool
+        description: Enable the monitoring of the servers by OVH
+    no_intervention:
+        required: false
+        type: bool
+        description: Prevent the proactive interventions of OVH on the servers
+    rescue_ssh_key:
+        required: false
+        description: Public SSH key to use in rescue mode
+    boot_id:
+        required: false
+        type: int
+        description: Id of the netboot to use, see dedicated_server_boot to set it from its name
+    rescue_mail:
+        required: false
+        description: Mail address receiving the rescue credentials
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of API calls running at the same time
+'''
+
+EXAMPLES = r'''
+- name: Set the properties of a server
+  synthesio.ovh.dedicated_server_properties:
+    service_name: "{{ ovhname }}"
+    monitoring: true
+    no_intervention: false
+    rescue_ssh_key: "{{ lookup('file', '~/.ssh/id_rsa.pub') }}"
+  delegate_to: localhost
+
+- name: Disable the monitoring of the fleet
+  synthesio.ovh.dedicated_server_properties:
+    service_names: "{{ groups['ovh'] | map('extract', hostvars, 'ovhname') | list }}"
+    monitoring: false
+  delegate_to: localhost
+  run_once: true
+'''
+
+RETURN = '''
+servers:
+    description: The properties changed on each server, with their previous value.
+    returned: always
+    type: list
+    sample: [{"service_name": "ns12345.ip-1-2-3.eu", "changes": {"monitoring": {"before": true, "after": false}},
+              "error": null}]
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEFAULT_MAX_WORKERS,
+    OVH,
+    ovh_argument_spec,
+)
+
+# Module option => property of /dedicated/server/{serviceName}
+PROPERTIES = {
+    "monitoring": "monitoring",
+    "no_intervention": "noIntervention",
+    "rescue_ssh_key": "rescueSshKey",
+    "boot_id": "bootId",
+    "rescue_mail": "rescueMail",
+}
+
+
+def properties_diff(state, wanted):
+    """
+    Properties of the server which differ from the wanted ones.
+    """
+    return {
+        prop: dict(before=state.get(prop), after=value)
+        for prop, value in wanted.items()
+        if state.get(prop) != value
+    }
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        service_name=dict(required=False, default=None),
+        service_names=dict(required=False, type="list", elements="str", default=None),
+        monitoring=dict(required=False, type="bool", default=None),
+        no_intervention=dict(required=False, type="bool", default=None),
+        rescue_ssh_key=dict(required=False, default=None, no_log=False),
+        boot_id=dict(required=False, type="int", default=None),
+        rescue_mail=dict(required=False, default=None),
+        max_workers=dict(required=False, type="int", default=DEFAULT_MAX_WORKERS),
+    ))
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=[("service_name", "service_names")],
+        required_one_of=[("service_name", "service_names")],
+    )
+    client = OVH(module)
+
+    service_names = module.params['service_names'] or [module.params['service_name']]
+    max_workers = module.params['max_workers']
+    wanted = {
+        prop: module.params[option]
+        for option, prop in PROPERTIES.items()
+        if module.params[option] is not None
+    }
+    if not wanted:
+        module.fail_json(msg=f"At least one property must be set: {list(PROPERTIES)}")
+
+    servers = [dict(service_name=service_name, changes={}, error=None) for service_name in service_names]
+
+    states = client.wrap_calls(
+        [("GET", f"/dedicated/server/{service_name}", {}) for service_name in service_names],
+        max_workers=max_workers,
+        return_errors=True,
+    )
+    for server, state in zip(servers, states):
+        if isinstance(state, Exception):
+            server['error'] = str(state)
+        else:
+            server['changes'] = properties_diff(state, wanted)
+
+    to_update = [server for server in servers if server['changes']]
+    changed = bool(to_update)
+
+    if not module.check_mode:
+        # A single call for all the properties of a server
+        results = client.wrap_calls(
+            [
+                (
+                    "PUT",
+                    f"/dedicated/server/{server['service_name']}",
+                    {prop: change['after'] for prop, change in server['changes'].items()},
+                )
+                for server in to_update
+            ],
+            max_workers=max_workers,
+            return_errors=True,
+        )
+        for server, result in zip(to_update, results):
+            if isinstance(result, Exception):
+                server['error'] = str(result)
+
+    failed = [server for server in servers if server['error']]
+    message = f"{len(to_update)}/{len(servers)} servers updated"
+    if module.check_mode:
+        message = f"{message} - (dry run mode)"
+    if failed:
+        module.fail_json(
+            msg=f"{message}, failed: {[(server['service_name'], server['error']) for server in failed]}",
+            changed=changed,
+            servers=servers,
+        )
+
+    module.exit_json(msg=message, changed=changed, servers=servers)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -29,6 +29,32 @@ options:
         default: present
         choices: ['present','absent']
         description: Indicate the desired state of vrack
+    wait:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Wait for the vrack task adding or removing the server to be done
+            - Without it, the task id is returned, see tasks_wait to wait for the tasks of many servers at once
+    max_retry:
+        required: false
+        description:
+            - Number of retry
+            - Without C(timeout), the maximum wait time is C(max_retry) x C(sleep)
+        default: 120
+    sleep:
+        required: false
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff
+        default: 5
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description: Maximum time in seconds to wait
 
 '''
 
@@ -38,11 +64,57 @@ EXAMPLES = r'''
     service_name: {{ service_name }}
     vrack: "{{ vrack }}"
   delegate_to: localhost
+
+- name: Add the dedicated server to the vrack, and wait until it is done
+  synthesio.ovh.dedicated_server_vrack:
+    service_name: "{{ service_name }}"
+    vrack: "{{ vrack }}"
+    wait: true
+  delegate_to: localhost
 '''
 
-RETURN = ''' # '''
+RETURN = '''
+task_id:
+    description: Id of the vrack task adding or removing the server.
+    returned: when changed
+    type: int
+    sample: 123456
+polling:
+    description: Polling statistics of the wait.
+    returned: when changed and wait is set
+    type: dict
+    sample: {"polls": 4, "elapsed": 35.2, "slept": 33.8, "last_interval": 11.2}
+'''
 
-from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, ovh_argument_spec
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    OVH,
+    TASK_ERROR_STATUSES,
+    Waiter,
+    ovh_argument_spec,
+    ovh_wait_argument_spec,
+    wait_for_tasks,
+)
+
+
+def exit_with_task(module, client, vrack, task, msg):
+    """
+    Exit once the vrack task is submitted, or done when waiting for it.
+    vrack tasks are deleted once done.
+    """
+    if not module.params['wait']:
+        module.exit_json(msg=msg, changed=True, task_id=task['id'])
+
+    waiter = Waiter.from_params(module.params)
+    result = wait_for_tasks(
+        client, waiter, [dict(path=f"/vrack/{vrack}/task/{task['id']}", missing_status="done")]
+    )[0]
+    if result['status'] == "done":
+        module.exit_json(msg=msg, changed=True, task_id=task['id'], polling=waiter.stats())
+    if result['status'] in TASK_ERROR_STATUSES:
+        module.fail_json(msg=f"Task {task['id']} ended in {result['status']} status", changed=True,
+                         task_id=task['id'], polling=waiter.stats())
+    module.fail_json(msg=f"Max wait time reached, about {waiter.stats()['elapsed']} seconds", changed=True,
+                     task_id=task['id'], polling=waiter.stats())
 
 
 def run_module():
@@ -50,8 +122,10 @@ def run_module():
     module_args.update(dict(
         service_name=dict(required=True),
         vrack=dict(required=True),
-        state=dict(choices=['present', 'absent'], default='present')
+        state=dict(choices=['present', 'absent'], default='present'),
+        wait=dict(required=False, type="bool", default=False)
     ))
+    module_args.update(ovh_wait_argument_spec(max_retry=120, sleep=5))
 
     module = AnsibleModule(
         argument_spec=module_args,
@@ -117,10 +191,9 @@ def run_module():
                         "DELETE",
                         f"/vrack/{vrack}/dedicatedServerInterface/{server_interface}"
                     )
-                    module.exit_json(
-                        msg="{} has been deleted from new {}".format(
-                            service_name, vrack),
-                        changed=True)
+                    exit_with_task(
+                        module, client, vrack, result,
+                        "{} has been deleted from new {}".format(service_name, vrack))
 
         if state == 'absent':
             module.exit_json(
@@ -129,12 +202,12 @@ def run_module():
                 changed=False)
 
         # Server is not yet registered on vrack, go for it
-        client.wrap_call(
+        result = client.wrap_call(
             "POST",
             f"/vrack/{vrack}/dedicatedServerInterface",
             dedicatedServerInterface=server_interface
         )
-        module.exit_json(msg="{} has been added to new {}".format(service_name, vrack), changed=True)
+        exit_with_task(module, client, vrack, result, "{} has been added to new {}".format(service_name, vrack))
 
     # Old generation
     else:
@@ -155,10 +228,9 @@ def run_module():
                         "DELETE",
                         f"/vrack/{vrack}/dedicatedServer/{service_name}"
                     )
-                    module.exit_json(
-                        msg="{} has been deleted from old {}".format(
-                            service_name, vrack),
-                        changed=True)
+                    exit_with_task(
+                        module, client, vrack, result,
+                        "{} has been deleted from old {}".format(service_name, vrack))
 
         if state == 'absent':
             module.exit_json(
@@ -167,12 +239,12 @@ def run_module():
                 changed=False)
 
         # Server is not yet registered on vrack, go for it
-        client.wrap_call(
+        result = client.wrap_call(
             "POST",
             f"/vrack/{vrack}/dedicatedServer",
             dedicatedServer=service_name
         )
-        module.exit_json(msg="{} has been added to old {}".format(service_name, vrack), changed=True)
+        exit_with_task(module, client, vrack, result, "{} has been added to old {}".format(service_name, vrack))
 
 
 def main():
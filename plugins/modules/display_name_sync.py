@@ -0,0 +1,189 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: display_name_sync
+short_description: Set the display name of many dedicated servers and VPS
+description:
+    - Set the display name of many dedicated servers and VPS in ovh manager, in a single task.
+    - The current display names are read concurrently, from the services of the account for the dedicated
+      servers and from the VPS themselves, and only the ones which differ are updated, concurrently.
+    - Each display name is compared with the field the module writes, so a run right after another one
+      reports no change.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    dedicated_servers:
+        required: false
+        type: dict
+        default: {}
+        description: Display name to set, by dedicated server service name
+    vps:
+        required: false
+        type: dict
+        default: {}
+        description: Display name to set, by VPS service name
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of API calls running at the same time
+    services_cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the serviceId of the dedicated servers
+            - With it, only the services of the servers to rename are read
+'''
+
+EXAMPLES = r'''
+- name: Rename the whole environment
+  synthesio.ovh.display_name_sync:
+    dedicated_servers: "{{ dict(groups['ovh'] | map('extract', hostvars, 'ovhname') | zip(groups['ovh'])) }}"
+    vps: "{{ dict(groups['vps'] | map('extract', hostvars, 'vpsname') | zip(groups['vps'])) }}"
+    services_cache_file: "~/.cache/ovh/services.json"
+  delegate_to: localhost
+  run_once: true
+'''
+
+RETURN = '''
+resources:
+    description: Display name of each server and VPS, and its outcome (changed, unchanged, failed).
+    returned: always
+    type: list
+    sample: [{"product": "dedicated_server", "service_name": "ns12345.ip-1-2-3.eu", "display_name_before": "old",
+              "display_name": "ceph-1", "status": "changed", "error": null}]
+summary:
+    description: Number of resources by outcome.
+    returned: always
+    type: dict
+    sample: {"changed": 12, "unchanged": 288}
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    DEFAULT_MAX_WORKERS,
+    OVH,
+    OVHResourceNotFound,
+    ServicesIndex,
+    count_statuses,
+    ovh_argument_spec,
+)
+
+
+def read_dedicated_servers(client, names, params):
+    """
+    Services of the dedicated servers, whose resource holds the display name set through /service/{serviceId}.
+    """
+    index = ServicesIndex(client, "/dedicated/server/{serviceName}", params['services_cache_file'], params['max_workers'])
+    services = index.services(names)
+    return {
+        name: services[name] if name in services else OVHResourceNotFound(f"No service found for {name}")
+        for name in names
+    }
+
+
+def read_vps(client, names, params):
+    """
+    The VPS themselves, holding the display name set through /vps/{serviceName}, see vps_display_name.
+    """
+    results = client.wrap_calls(
+        [("GET", f"/vps/{name}", {}) for name in names],
+        max_workers=params['max_workers'],
+        return_errors=True,
+    )
+    return dict(zip(names, results))
+
+
+# Product => reads of the resources, their current display name, and the call setting it
+PRODUCTS = {
+    "dedicated_server": dict(
+        read=read_dedicated_servers,
+        display_name=lambda service: service['resource'].get('displayName'),
+        update=lambda name, service, display_name: (
+            "PUT", f"/service/{service['serviceId']}", dict(resource=dict(displayName=display_name, name=name))
+        ),
+    ),
+    "vps": dict(
+        read=read_vps,
+        display_name=lambda vps: vps.get('displayName'),
+        update=lambda name, vps, display_name: ("PUT", f"/vps/{name}", dict(displayName=display_name)),
+    ),
+}
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        dedicated_servers=dict(required=False, type="dict", default={}),
+        vps=dict(required=False, type="dict", default={}),
+        max_workers=dict(required=False, type="int", default=DEFAULT_MAX_WORKERS),
+        services_cache_file=dict(required=False, default=None),
+    ))
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    client = OVH(module)
+
+    max_workers = module.params['max_workers']
+    wanted = dict(
+        dedicated_server=module.params['dedicated_servers'] or {},
+        vps=module.params['vps'] or {},
+    )
+
+    resources = []
+    calls = []
+    for product, display_names in wanted.items():
+        if not display_names:
+            continue
+        current = PRODUCTS[product]['read'](client, list(display_names), module.params)
+        for name, display_name in display_names.items():
+            resource = dict(product=product, service_name=name, display_name_before=None,
+                            display_name=display_name, status="unchanged", error=None)
+            resources.append(resource)
+            if isinstance(current[name], Exception):
+                resource.update(status="failed", error=str(current[name]))
+                continue
+            resource['display_name_before'] = PRODUCTS[product]['display_name'](current[name])
+            if resource['display_name_before'] != display_name:
+                resource['status'] = "changed"
+                calls.append((resource, PRODUCTS[product]['update'](name, current[name], display_name)))
+
+    if not module.check_mode:
+        results = client.wrap_calls([call for _, call in calls], max_workers=max_workers, return_errors=True)
+        for (resource, _), result in zip(calls, results):
+            if isinstance(result, Exception):
+                resource.update(status="failed", error=str(result))
+
+    summary = count_statuses(resources)
+
+    changed = bool(summary.get('changed'))
+    message = f"displayName set on {summary.get('changed', 0)}/{len(resources)} resources"
+    if module.check_mode:
+        message = f"{message} - (dry run mode)"
+
+    failed = [resource for resource in resources if resource['status'] == "failed"]
+    if failed:
+        module.fail_json(
+            msg=f"{message}, failed: {[(resource['service_name'], resource['error']) for resource in failed]}",
+            changed=changed,
+            resources=resources,
+            summary=summary,
+        )
+
+    module.exit_json(msg=message, changed=changed, resources=resources, summary=summary)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -39,10 +39,11 @@ options:
         description: Keep existings values and append
         description: This switch allows to have multiple record for the same name with different values. It will append values to existing one.
         default: false
-    ttl:
+    record_ttl:
         required: false
-        default: 0
-        description: Time To live for the given record
+        description:
+            - Time To live for the given record
+            - When set, existing records with a different ttl are updated. New records are created with a ttl of 0 (zone default) if not set.
 
 """
 
@@ -58,46 +59,92 @@ EXAMPLES = r"""
 
 RETURN = """ # """
 
+import re
+from collections import Counter
+
 from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
     OVH,
     ovh_argument_spec,
 )
 
 
-def validate_record(existing_records, client, record_type, name, domain, value):
+TXT_CHUNK = re.compile(r'"((?:[^"\\]|\\.)*)"')
+TXT_CHUNKS = re.compile(r'\s*("(?:[^"\\]|\\.)*"\s*)+')
+
+
+def normalize_target(target):
+    """
+    Normalize a record target so that API values and module values compare equal.
+    Long TXT values are returned by the API as several quoted chunks ("abc" "def"),
+    they are joined back into a single string.
+    """
+    target = target.strip()
+    # Only a target made of quoted chunks and nothing else is joined
+    if TXT_CHUNKS.fullmatch(target):
+        return "".join(TXT_CHUNK.findall(target))
+    return target.replace('"', "")
+
+
+def get_existing_records(client, domain, record_ids):
     """
-    Verify if an existing record match the desired record.
-    Returning the exit message used for the module exit.
+    Fetch the details of every record id of the zone.
     """
-    changed = False
-    # We can have multiple records with different values for the same domain name.
-    # Build a list of those values to compare with the one we want.
-    existing_values = list()
-    for record_id in existing_records:
+    records = []
+    for record_id in record_ids:
         record = client.wrap_call("GET", f"/domain/zone/{domain}/record/{record_id}")
-        existing_values.append(record["target"].replace('"', ""))
+        records.append(dict(
+            id=record_id,
+            target=record["target"],
+            normalized=normalize_target(record["target"]),
+            ttl=record.get("ttl"),
+        ))
+    return records
 
-    # Compare lists of values
-    to_delete = [x for x in existing_values + value if x not in value]
-    to_add = [x for x in existing_values + value if x not in existing_values]
 
-    pre_message = f"{record_type} record {name}.{domain}"
-    message = " "
-    if to_delete:
-        message = (
-            message + f"value {', '.join(to_delete)} should be removed. Changes needed."
-        )
-        changed = True
-    if to_add:
-        message = (
-            message
-            + f"{record_type} record {name}.{domain} should be {', '.join(to_add)}. Changes needed."
-        )
-        changed = True
-    if not to_delete and not to_add:
-        message = f" already set to  {', '.join(value)}. No changes."
+def plan_record_changes(records, value, state, append, record_ttl):
+    """
+    Compute the changes needed to go from the existing records to the wanted values.
+    Values are compared as multisets: each wanted value is matched with at most one
+    existing record, extra duplicates are removed unless 'append' is set.
+    Returns a dict of lists: records to delete, records to update (ttl), values to add.
+    """
+    wanted = Counter(normalize_target(v) for v in value)
+    plan = dict(delete=[], update=[], add=[])
+
+    if state == "absent":
+        plan["delete"] = [record for record in records if record["normalized"] in wanted]
+        return plan
+
+    for record in records:
+        if wanted[record["normalized"]] > 0:
+            wanted[record["normalized"]] -= 1
+            if record_ttl is not None and record["ttl"] != record_ttl:
+                plan["update"].append(record)
+        elif not append:
+            plan["delete"].append(record)
+
+    # Keep the order given by the user for the values to create
+    for v in value:
+        normalized = normalize_target(v)
+        if wanted[normalized] > 0:
+            wanted[normalized] -= 1
+            plan["add"].append(v)
+
+    return plan
+
 
-    return pre_message + message, changed
+def plan_message(plan, record_type, name, domain, record_ttl):
+    """
+    Build a human readable description of a plan.
+    """
+    messages = []
+    if plan["delete"]:
+        messages.append(f"{', '.join(r['target'] for r in plan['delete'])} deleted")
+    if plan["update"]:
+        messages.append(f"{', '.join(r['target'] for r in plan['update'])} ttl set to {record_ttl}")
+    if plan["add"]:
+        messages.append(f"{', '.join(plan['add'])} created")
+    return f"{' and '.join(messages)} from {record_type} record {name}.{domain}"
 
 
 def run_module():
@@ -130,7 +177,7 @@ def run_module():
                 default="A",
             ),
             state=dict(choices=["present", "absent"], default="present"),
-            record_ttl=dict(type="int", required=False, default=0),
+            record_ttl=dict(type="int", required=False, default=None),
             append=dict(required=False, default=False, type="bool"),
         )
     )
@@ -145,118 +192,62 @@ def run_module():
     state = module.params["state"]
     append = module.params["append"]
     record_ttl = module.params["record_ttl"]
-    changed = False
 
     existing_records = client.wrap_call(
         "GET", f"/domain/zone/{domain}/record", fieldType=record_type, subDomain=name
     )
-
-    if module.check_mode:
-        # Check for existing records
-        if existing_records:
-            exit_message, changed = validate_record(
-                existing_records, client, record_type, name, domain, value
-            )
-
-        else:
-            exit_message = (
-                f"{record_type} record {', '.join(value)} absent from {name}.{domain}."
-            )
-            if state == "present":
-                exit_message = exit_message + " Changes needed."
-                changed = True
-            else:
-                exit_message = exit_message + " No changes."
-
-        module.exit_json(msg=f"(dry run mode) {exit_message}", changed=changed)
-
-    record_created = []
-    record_deleted = []
+    records = get_existing_records(client, domain, existing_records)
 
     # How record is handled
     # A record (here) is composed with a name, a value and a type.
-    # - if we have existant record:
-    #   - if the value is *not* in the value of the module:
+    # - state present:
+    #   - an existing record whose value is wanted is kept (its ttl is updated if needed),
+    #     each wanted value matches at most one existing record
+    #   - an existing record whose value is *not* wanted:
     #     - if the parameter 'append' is set: ==> keep the record
     #     - else: ==> delete the record
-    #   - if the value is in the value of the module: ==> keep the record
-    #     and complete with other values if any
-    # - if there is no record: ==> create record for each value in the module
-
-    if state == "present":
-        if existing_records:
-            for record_id in existing_records:
-                record = client.wrap_call(
-                    "GET", f"/domain/zone/{domain}/record/{record_id}"
-                )
-                # If the record exist with the desired value
-                # we can remove the value from the list to be created later
-                if record["target"] in value:
-                    value.remove(record["target"])
-
-                # If the record exist with an unwanted value, and we must not append it,
-                # we will removed it from the zone.
-                elif record["target"] not in value and not append:
-                    client.wrap_call(
-                        "DELETE", f"/domain/zone/{domain}/record/{record_id}"
-                    )
-                    record_deleted.append(record["target"])
-
-        for v in value:
-            client.wrap_call(
-                "POST",
-                f"/domain/zone/{domain}/record",
-                fieldType=record_type,
-                subDomain=name,
-                target=v,
-                ttl=record_ttl,
-            )
-            record_created.append(v)
-
-        if len(record_deleted) + len(record_created):
-            # we must run a refresh on zone after modifications
-            client.wrap_call("POST", f"/domain/zone/{domain}/refresh")
-
-            msg = ""
-            if len(record_deleted):
-                msg += f"{', '.join(record_deleted)} deleted"
-            if len(record_created):
-                if len(record_deleted):
-                    msg += " and "
-                msg += f"{', '.join(record_created)} created"
-            msg += f" from record {name}.{domain}"
-
-            module.exit_json(msg=msg, changed=True)
+    #   - wanted values without a matching record are created
+    # - state absent: every existing record whose value is listed is deleted
+    # Check mode and apply mode share the same plan.
+    plan = plan_record_changes(records, value, state, append, record_ttl)
+    changed = bool(plan["delete"] or plan["update"] or plan["add"])
+
+    if not changed:
+        if state == "absent":
+            exit_message = f"Target {name} doesn't exist on domain {domain}"
         else:
-            module.exit_json(
-                msg=f"{name} is already up-to-date on domain {domain}",
-                changed=False,
-            )
-
-    elif state == "absent":
-        if not existing_records:
-            module.exit_json(
-                msg=f"Target {name} doesn't exist on domain {domain}",
-                changed=False,
-            )
-
-        for record_id in existing_records:
-            record = client.wrap_call(
-                "GET", f"/domain/zone/{domain}/record/{record_id}"
-            )
-
-            if record["target"] in value:
-                client.wrap_call("DELETE", f"/domain/zone/{domain}/record/{record_id}")
-                record_deleted.append(record["target"])
-
-        # we must run a refresh on zone after modifications
-        client.wrap_call("POST", f"/domain/zone/{domain}/refresh")
-
-        module.exit_json(
-            msg=f"{', '.join(record_deleted)} deleted from record {name}.{domain}",
-            changed=True,
+            exit_message = f"{name} is already up-to-date on domain {domain}"
+        if module.check_mode:
+            exit_message = f"(dry run mode) {exit_message}"
+        module.exit_json(msg=exit_message, changed=False)
+
+    exit_message = plan_message(plan, record_type, name, domain, record_ttl)
+    if module.check_mode:
+        module.exit_json(msg=f"(dry run mode) {exit_message}", changed=True)
+
+    for record in plan["delete"]:
+        client.wrap_call("DELETE", f"/domain/zone/{domain}/record/{record['id']}")
+
+    for record in plan["update"]:
+        client.wrap_call(
+            "PUT", f"/domain/zone/{domain}/record/{record['id']}", ttl=record_ttl
         )
 
+    for v in plan["add"]:
+        client.wrap_call(
+            "POST",
+            f"/domain/zone/{domain}/record",
+            fieldType=record_type,
+            subDomain=name,
+            target=v,
+            ttl=record_ttl or 0,
+        )
+
+    # we must run a refresh on zone after modifications
+    client.wrap_call("POST", f"/domain/zone/{domain}/refresh")
+
+    module.exit_json(msg=exit_message, changed=True)
+
 
 def main():
     run_module()
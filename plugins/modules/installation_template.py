@@ -25,6 +25,23 @@ options:
     service_name:
         required: false
         description: The server name (used for hardware raid profils)
+    cache_file:
+        required: false
+        description:
+            - Path of a local JSON file caching the hardware raid profile of the server, which never change
+            - Cached entries have no expiration
+    cache_flush:
+        required: false
+        type: bool
+        default: false
+        description: Remove the cached entries of the server before reading them
+    cache_validate:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Read again the cached entries if the server was reinstalled or had an intervention since they were cached
+            - It costs two API calls
 '''
 
 EXAMPLES = r'''
@@ -41,7 +58,13 @@ import yaml
 import os
 import ast
 
-from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import OVH, ovh_argument_spec
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    OVH,
+    ImmutableCache,
+    ovh_argument_spec,
+    ovh_cache_argument_spec,
+    server_generation,
+)
 
 
 def run_module():
@@ -51,6 +74,7 @@ def run_module():
         state=dict(choices=["present", "absent"], default="present"),
         service_name=dict(required=False, default=None)
     ))
+    module_args.update(ovh_cache_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
@@ -121,9 +145,9 @@ def run_module():
     )
 
     if conf['isHardwareRaid']:
-        result = client.wrap_call(
-            "GET", f"/dedicated/server/{service_name}/install/hardwareRaidProfile"
-        )
+        cache = ImmutableCache.from_params(client, module.params, prefix=f"/dedicated/server/{service_name}/")
+        generation = server_generation(client, service_name) if module.params['cache_validate'] else None
+        result = cache.get(f"/dedicated/server/{service_name}/install/hardwareRaidProfile", generation)
 
         if len(result['controllers']) != 1:
             module.fail_json(
@@ -0,0 +1,224 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+from urllib.parse import quote
+
+DOCUMENTATION = '''
+---
+module: tasks_wait
+short_description: Wait until a list of OVH tasks are done
+description:
+    - Wait until a list of asynchronous OVH tasks are done, whatever their product.
+    - All the tasks are polled concurrently in a single process, with an adaptive backoff and a shared rate budget.
+    - Can be used to wait once for operations launched on many services, instead of waiting on each one.
+author: Synthesio SRE Team
+requirements:
+    - ovh >= 0.5.0
+options:
+    tasks:
+        required: true
+        type: list
+        description:
+            - List of tasks to wait for. Each task is a dictionary with the keys C(product), C(service_name) and C(task_id)
+            - C(product) is one of C(dedicated_server), C(nasha), C(ip), C(vps), C(domain_zone) or C(vrack)
+            - C(service_name) is the server, NAS, IP block, VPS, DNS zone or vRack owning the task
+    max_workers:
+        required: false
+        type: int
+        default: 10
+        description: Maximum number of tasks polled at the same time
+    rate_limit:
+        required: false
+        type: float
+        description: Maximum number of API calls per second, shared by all the polls
+    fail_on_error:
+        required: false
+        type: bool
+        default: true
+        description: Fail if a task is not done at the end of the wait
+    max_retry:
+        required: false
+        description:
+            - Number of retry
+            - Without C(timeout), the maximum wait time is C(max_retry) x C(sleep)
+        default: 240
+    sleep:
+        required: false
+        description:
+            - Minimum time to sleep between retries
+            - The interval grows with an exponential backoff while no task completes
+        default: 10
+    max_sleep:
+        required: false
+        description: Maximum time to sleep between retries
+        default: 60
+    timeout:
+        required: false
+        description: Maximum time in seconds to wait
+'''
+
+EXAMPLES = r'''
+- name: Reinstall servers
+  synthesio.ovh.dedicated_server_installation:
+    service_name: "{{ item }}"
+    operating_system: "debian12_64"
+  loop: "{{ servers }}"
+  delegate_to: localhost
+  register: installations
+
+- name: Wait for all the installations at once
+  synthesio.ovh.tasks_wait:
+    tasks: "{{ installations.results | community.general.json_query(query) }}"
+    timeout: 3600
+  vars:
+    query: "[].{product: 'dedicated_server', service_name: item, task_id: task_id}"
+  delegate_to: localhost
+
+- name: Add servers to a vrack
+  synthesio.ovh.dedicated_server_vrack:
+    service_name: "{{ item }}"
+    vrack: "{{ vrack }}"
+  loop: "{{ servers }}"
+  delegate_to: localhost
+  register: vrack_additions
+
+- name: Wait for the vrack tasks before configuring the network
+  synthesio.ovh.tasks_wait:
+    tasks: "{{ vrack_additions.results | selectattr('task_id', 'defined') | community.general.json_query(query) }}"
+  vars:
+    query: "[].{product: 'vrack', service_name: '{{ vrack }}', task_id: task_id}"
+  delegate_to: localhost
+
+- name: Wait for a nasha task and a vrack task
+  synthesio.ovh.tasks_wait:
+    tasks:
+      - product: nasha
+        service_name: "zpool-123456"
+        task_id: 123456
+      - product: vrack
+        service_name: "pn-123456"
+        task_id: 654321
+  delegate_to: localhost
+'''
+
+RETURN = '''
+tasks:
+    description: Each task with its last status, operation and duration of the wait in seconds.
+    returned: always
+    type: list
+    sample: [{"product": "dedicated_server", "service_name": "ns12345.ip-1-2-3.eu", "task_id": 123456,
+              "status": "done", "operation": "reinstallServer", "duration": 923.4}]
+summary:
+    description: Number of tasks by final status.
+    returned: always
+    type: dict
+    sample: {"done": 198, "ovhError": 1, "doing": 1}
+polling:
+    description: Polling statistics of the wait.
+    returned: always
+    type: dict
+    sample: {"polls": 24, "elapsed": 1203.1, "slept": 1180.7, "last_interval": 60.0}
+'''
+
+from ansible_collections.synthesio.ovh.plugins.module_utils.ovh import (
+    OVH,
+    DEFAULT_MAX_WORKERS,
+    RateLimiter,
+    Waiter,
+    count_statuses,
+    ovh_argument_spec,
+    ovh_wait_argument_spec,
+    wait_for_tasks,
+)
+
+# API route of the tasks of each product
+TASK_PATHS = {
+    "dedicated_server": "/dedicated/server/{service_name}/task/{task_id}",
+    "nasha": "/dedicated/nasha/{service_name}/task/{task_id}",
+    "ip": "/ip/{service_name}/task/{task_id}",
+    "vps": "/vps/{service_name}/tasks/{task_id}",
+    "domain_zone": "/domain/zone/{service_name}/task/{task_id}",
+    "vrack": "/vrack/{service_name}/task/{task_id}",
+}
+
+# vRack tasks are deleted once done
+TASK_MISSING_STATUSES = {
+    "vrack": "done",
+}
+
+
+def build_task(module, task):
+    product = task.get("product")
+    service_name = task.get("service_name")
+    task_id = task.get("task_id")
+    if product not in TASK_PATHS:
+        module.fail_json(msg=f"Unknown product {product} for task {task_id}, must be one of {list(TASK_PATHS)}")
+    if not service_name or task_id is None:
+        module.fail_json(msg=f"Task {task} must have a service_name and a task_id")
+
+    result = dict(
+        product=product,
+        service_name=service_name,
+        task_id=task_id,
+        path=TASK_PATHS[product].format(service_name=quote(str(service_name), safe=''), task_id=task_id),
+    )
+    if product in TASK_MISSING_STATUSES:
+        result["missing_status"] = TASK_MISSING_STATUSES[product]
+    return result
+
+
+def run_module():
+    module_args = ovh_argument_spec()
+    module_args.update(dict(
+        tasks=dict(required=True, type="list", elements="dict"),
+        max_workers=dict(required=False, type="int", default=DEFAULT_MAX_WORKERS),
+        rate_limit=dict(required=False, type="float", default=None),
+        fail_on_error=dict(required=False, type="bool", default=True),
+    ))
+    module_args.update(ovh_wait_argument_spec())
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    client = OVH(module)
+
+    tasks = [build_task(module, task) for task in module.params['tasks']]
+    max_workers = module.params['max_workers']
+    rate_limit = module.params['rate_limit']
+    fail_on_error = module.params['fail_on_error']
+
+    if module.check_mode:
+        module.exit_json(msg="done - (dry run mode)", changed=False)
+
+    if rate_limit:
+        client.rate_limiter = RateLimiter(rate_limit)
+
+    waiter = Waiter.from_params(module.params)
+    results = wait_for_tasks(client, waiter, tasks, max_workers=max_workers)
+
+    summary = count_statuses(results)
+
+    not_done = [result for result in results if result['status'] != "done"]
+    message = f"{len(results) - len(not_done)}/{len(results)} tasks done"
+    if not_done and fail_on_error:
+        module.fail_json(
+            msg=f"{message}, not done: {[(r['service_name'], r['task_id'], r['status']) for r in not_done]}",
+            tasks=results,
+            summary=summary,
+            polling=waiter.stats(),
+        )
+
+    module.exit_json(msg=message, changed=False, tasks=results, summary=summary, polling=waiter.stats())
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()